@@ -0,0 +1,49 @@
+"""Batch churn-risk scoring throughput.
+
+Run from the ``code`` directory:
+
+    python -m benchmarks.bench_churn --rows 1000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.analytics import churn_risk_category, score_churn_risk
+
+
+def make_signals(rows, seed=0):
+    """Satisfaction and engagement columns with the generator's ranges"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'nps_score': rng.integers(0, 11, rows),
+        'csat': rng.integers(1, 6, rows),
+        'complaints': rng.integers(0, 4, rows),
+        'customer_service_contacts': rng.integers(0, 3, rows),
+        'abandoned_carts': rng.integers(0, 5, rows),
+        'app_logins': rng.integers(10, 150, rows),
+        'sentiment': rng.uniform(-1, 1, rows)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_signals(args.rows)
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        risk = score_churn_risk(df)
+        churn_risk_category(risk)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"rows:        {args.rows:,}")
+    print(f"best of {args.repeats}:   {best * 1000:.1f} ms")
+    print(f"throughput:  {args.rows / best:,.0f} rows/sec")
+
+
+if __name__ == '__main__':
+    main()
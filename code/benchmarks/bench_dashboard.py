@@ -0,0 +1,90 @@
+"""Dashboard latency under concurrent requests: sequential vs streamed.
+
+All requests arrive at once. The sequential path renders them one after
+another with ``generate_dashboard`` and a new engine per call; the
+streamed path serves them together with ``stream_dashboard``, one shared
+engine and a thread (or process) pool for the charts. Run from the ``code`` directory:
+
+    python -m benchmarks.bench_dashboard --customers 200000 --requests 32
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+import numpy as np
+import plotly.graph_objects as go
+from src import dashboard
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
+from src.recommendations import BankingRecommendationEngine
+
+
+def run_sequential(analytics, customer_ids):
+    """First-section and completion time of each request, served in turn"""
+    first, done = [], []
+    start = time.perf_counter()
+    for customer_id in customer_ids:
+        seen = []
+        with mock.patch.object(dashboard, 'display', lambda html: seen.append(time.perf_counter())):
+            dashboard.generate_dashboard(customer_id, analytics.df, analytics)
+        first.append(seen[0] - start)
+        done.append(time.perf_counter() - start)
+    return np.array(first), np.array(done)
+
+
+async def run_streamed(analytics, customer_ids, workers, processes=False):
+    """First-section and completion time of each request, served together"""
+    engine = BankingRecommendationEngine(analytics)
+    start = time.perf_counter()
+
+    async def serve(customer_id, executor):
+        first = None
+        async for _ in dashboard.stream_dashboard(customer_id, analytics.df, analytics,
+                                                  engine=engine, executor=executor):
+            if first is None:
+                first = time.perf_counter() - start
+        return first, time.perf_counter() - start
+
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool(max_workers=workers) as executor:
+        if processes:
+            # Start the workers before the clock matters
+            list(executor.map(abs, range(workers)))
+            start = time.perf_counter()
+        results = await asyncio.gather(*(serve(c, executor) for c in customer_ids))
+    first, done = zip(*results)
+    return np.array(first), np.array(done)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--processes', action='store_true',
+                        help='build charts on a process pool instead of threads')
+    args = parser.parse_args()
+
+    analytics = BankingCustomerAnalytics(
+        generate_synthetic_banking_data(args.customers), training_sample=min(args.customers, 20_000)
+    )
+    rng = np.random.default_rng(0)
+    customer_ids = rng.choice(analytics.df['customer_id'].to_numpy(), args.requests, replace=False)
+
+    with mock.patch.object(go.Figure, 'show'):
+        results = {
+            'sequential': run_sequential(analytics, customer_ids),
+            'streamed': asyncio.run(run_streamed(analytics, customer_ids, args.workers, args.processes))
+        }
+
+    print(f"customers: {args.customers:,}   concurrent requests: {args.requests}")
+    print(f"{'':<12}{'first section ms':>20}{'total latency ms':>20}")
+    print(f"{'':<12}{'mean':>10}{'p95':>10}{'mean':>10}{'p95':>10}")
+    for name, (first, done) in results.items():
+        print(f"{name:<12}{first.mean() * 1000:>10.0f}{np.percentile(first, 95) * 1000:>10.0f}"
+              f"{done.mean() * 1000:>10.0f}{np.percentile(done, 95) * 1000:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Batch sentiment scoring of unique free-text comments against per-row VADER.
+
+Run from the ``code`` directory:
+
+    python -m benchmarks.bench_sentiment --rows 1000000 --jobs 4
+"""
+import argparse
+import time
+import numpy as np
+from src.sentiment import BANKING_LEXICON, BatchSentimentAnalyzer, banking_sentiment_analyzer
+
+FILLER = ("the app my card account branch fees online transfer statement loan rates "
+          "staff support mortgage savings checking payment was is are and but not "
+          "very really never so too extremely kind of").split()
+OPINION = ["good", "bad", "LOVE", "hate", "terrible", "helpful", "annoying", "fast",
+           "broken", "happy", "frustrated", "easy", "!!", "?", "great!", "slow."] + list(BANKING_LEXICON)
+
+
+def make_comments(rows, seed=0):
+    """Unique comments: random filler and opinion words plus a ticket reference"""
+    rng = np.random.default_rng(seed)
+    vocab = np.array(FILLER + OPINION, dtype=object)
+    lengths = rng.integers(4, 20, rows)
+    words = vocab[rng.integers(0, len(vocab), lengths.sum())]
+    ends = np.cumsum(lengths)
+    return [" ".join(words[end - n:end]) + f" ref{i}" for i, (n, end) in enumerate(zip(lengths, ends))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--baseline-rows', type=int, default=50_000,
+                        help='rows scored with per-row VADER (extrapolated)')
+    args = parser.parse_args()
+
+    texts = make_comments(args.rows)
+    batch = BatchSentimentAnalyzer()
+    start = time.perf_counter()
+    scores = batch.compound(texts, n_jobs=args.jobs)
+    batch_time = time.perf_counter() - start
+
+    sia = banking_sentiment_analyzer()
+    sample = texts[:args.baseline_rows]
+    start = time.perf_counter()
+    expected = np.array([sia.polarity_scores(t)['compound'] for t in sample])
+    row_time = (time.perf_counter() - start) * args.rows / len(sample)
+
+    diff = np.abs(scores[:len(sample)] - expected)
+    print(f"comments:        {args.rows:,} (all unique)")
+    print(f"batch ({args.jobs} jobs):  {batch_time:.2f} s  ({args.rows / batch_time:,.0f} comments/sec)")
+    print(f"per-row VADER:   {row_time:.2f} s  (extrapolated from {len(sample):,})")
+    print(f"speedup:         {row_time / batch_time:.1f}x")
+    print(f"agreement:       {(diff < 1e-9).mean():.2%} identical, max |diff| {diff.max():.4f}")
+
+
+if __name__ == '__main__':
+    main()
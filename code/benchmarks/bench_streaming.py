@@ -0,0 +1,55 @@
+"""Replay benchmark for streaming anomaly scoring.
+
+Run from the ``code`` directory:
+
+    python -m benchmarks.bench_streaming --customers 100000 --updates 2000000
+"""
+import argparse
+import time
+import numpy as np
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
+from src.streaming import StreamingAnomalyScorer, UPDATE_DTYPE, ACTIVITY_FIELDS, UPDATE_FIELDS
+
+
+def make_updates(customer_ids, num_updates, seed=0):
+    """Random activity stream over one day, mostly counter increments"""
+    rng = np.random.default_rng(seed)
+    updates = np.empty(num_updates, dtype=UPDATE_DTYPE)
+    updates['customer_id'] = rng.choice(customer_ids, num_updates)
+    updates['timestamp'] = 1_700_000_000 + np.sort(rng.integers(0, 86400, num_updates))
+    is_activity = rng.random(num_updates) < 0.9
+    updates['field'] = np.where(
+        is_activity,
+        rng.integers(0, len(ACTIVITY_FIELDS), num_updates),
+        rng.integers(len(ACTIVITY_FIELDS), len(UPDATE_FIELDS), num_updates)
+    )
+    updates['value'] = np.where(is_activity, 1.0, rng.lognormal(9, 1, num_updates))
+    return updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=100_000)
+    parser.add_argument('--updates', type=int, default=2_000_000)
+    parser.add_argument('--batch-size', type=int, default=4096)
+    args = parser.parse_args()
+
+    analytics = BankingCustomerAnalytics(generate_synthetic_banking_data(args.customers))
+    updates = make_updates(analytics.df['customer_id'].to_numpy(), args.updates)
+    scorer = StreamingAnomalyScorer(analytics)
+
+    start = time.perf_counter()
+    for _ in scorer.replay(updates, batch_size=args.batch_size):
+        pass
+    elapsed = time.perf_counter() - start
+
+    print(f"updates:       {scorer.updates_seen:,}")
+    print(f"alerts:        {scorer.alerts_raised:,}")
+    print(f"elapsed:       {elapsed:.2f}s")
+    print(f"throughput:    {scorer.updates_seen / elapsed:,.0f} updates/sec")
+    print(f"per update:    {elapsed / scorer.updates_seen * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Payload size and build time of the population views as customers scale.
+
+Run from the ``code`` directory:
+
+    python -m benchmarks.bench_visualization --rows 100000 1000000 5000000
+"""
+import argparse
+import time
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from src.analytics import DEFAULT_SEGMENT_NAMES, SEGMENT_FEATURES
+from src.visualization import create_density_map, create_segment_scatter, create_state_choropleth
+
+STATES = ['CA', 'TX', 'FL', 'NY', 'PA', 'IL', 'OH', 'GA', 'NC', 'MI', 'WA', 'AZ']
+
+
+def make_population(rows, seed=0):
+    """Scaled features and the columns the views read, for ``rows`` customers"""
+    rng = np.random.default_rng(seed)
+    segments = rng.integers(0, len(DEFAULT_SEGMENT_NAMES), rows)
+    centers = rng.normal(0, 2, (len(DEFAULT_SEGMENT_NAMES), len(SEGMENT_FEATURES)))
+    scaled = centers[segments] + rng.normal(0, 1, (rows, len(SEGMENT_FEATURES)))
+    df = pd.DataFrame({
+        'segment_name': pd.Categorical.from_codes(segments, list(DEFAULT_SEGMENT_NAMES.values())),
+        'state': pd.Categorical.from_codes(rng.integers(0, len(STATES), rows), STATES),
+        'income': rng.lognormal(11, 0.5, rows),
+        'credit_score': rng.integers(300, 851, rows),
+        'clv': rng.lognormal(8, 1, rows),
+        'is_anomaly': rng.random(rows) < 0.05
+    })
+    return SimpleNamespace(df=df, scaled_features=scaled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    views = {
+        'segment scatter': lambda p: create_segment_scatter(p),
+        'state choropleth': lambda p: create_state_choropleth(p.df, 'anomaly_rate'),
+        'density map': lambda p: create_density_map(p.df)
+    }
+    print(f"{'view':<18}{'rows':>12}{'build s':>10}{'payload KB':>12}")
+    for rows in args.rows:
+        population = make_population(rows)
+        for name, build in views.items():
+            start = time.perf_counter()
+            fig = build(population)
+            elapsed = time.perf_counter() - start
+            payload = len(fig.to_json()) / 1024
+            print(f"{name:<18}{rows:>12,}{elapsed:>10.2f}{payload:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,24 +9,62 @@ A comprehensive banking customer analytics system with:
 - Interactive financial dashboard
 """
 
-from .data_generation import generate_synthetic_banking_data
+from .data_generation import (
+    generate_synthetic_banking_data,
+    generate_transaction_events,
+    load_transaction_events
+)
 from .analytics import BankingCustomerAnalytics
 from .visualization import (
     create_spending_profile,
     create_financial_health_radar,
-    create_trend_projection
+    create_trend_projection,
+    create_segment_scatter,
+    create_state_choropleth,
+    create_density_map
 )
 from .recommendations import BankingRecommendationEngine
-from .dashboard import generate_dashboard
+from .dashboard import generate_dashboard, generate_dashboard_async, stream_dashboard
+from .cache import RecommendationCache
+from .aggregation import TransactionAggregator, aggregate_transactions
+from .streaming import StreamingAnomalyScorer
+from .model_selection import select_segmentation_model
+from .sharding import ShardedAnalytics
+from .feature_store import FeatureStore, write_feature_store
+from .cube import SegmentCube
+from .loader import load_customer_data
+from .propensity import ProductPropensityModel
+from .sentiment import BatchSentimentAnalyzer
+from .monitoring import DriftMonitor
 
 __all__ = [
     'generate_synthetic_banking_data',
+    'generate_transaction_events',
+    'load_transaction_events',
     'BankingCustomerAnalytics',
     'create_spending_profile',
     'create_financial_health_radar',
     'create_trend_projection',
+    'create_segment_scatter',
+    'create_state_choropleth',
+    'create_density_map',
     'BankingRecommendationEngine',
-    'generate_dashboard'
+    'generate_dashboard',
+    'generate_dashboard_async',
+    'stream_dashboard',
+    'RecommendationCache',
+    'TransactionAggregator',
+    'aggregate_transactions',
+    'StreamingAnomalyScorer',
+    'select_segmentation_model',
+    'ShardedAnalytics',
+    'FeatureStore',
+    'write_feature_store',
+    'SegmentCube',
+    'load_customer_data',
+    'ProductPropensityModel',
+    'BatchSentimentAnalyzer',
+    'DriftMonitor'
 ]
 
 __version__ = '0.1.0'
@@ -0,0 +1,135 @@
+import os
+import numpy as np
+import pandas as pd
+from .analytics import SPENDING_COLS
+from .data_generation import SPENDING_CATEGORIES, load_transaction_events
+
+SECONDS_PER_DAY = 86400
+
+
+class TransactionAggregator:
+    """Incrementally fold transaction events into per-customer aggregates.
+
+    State is a set of dense arrays indexed by the customer's row in
+    ``customer_ids``: category counts and amount sums, plus a ring of daily
+    buckets for the rolling window. Memory is therefore bounded by the number
+    of customers and the window length, never by the number of events.
+
+    The rolling window covers the ``window_days`` days up to the latest event
+    seen, so chunks may arrive in any order.
+    """
+
+    def __init__(self, customer_ids, window_days=30):
+        if window_days <= 0:
+            raise ValueError("window_days must be positive")
+        self.customer_ids = np.asarray(customer_ids, dtype=np.int64)
+        self._order = np.argsort(self.customer_ids, kind='stable')
+        self._sorted_ids = self.customer_ids[self._order]
+
+        n_customers = len(self.customer_ids)
+        n_categories = len(SPENDING_CATEGORIES)
+        self.counts = np.zeros((n_customers, n_categories), dtype=np.int64)
+        self.sums = np.zeros((n_customers, n_categories), dtype=np.float64)
+
+        self.window_days = window_days
+        self.window_counts = np.zeros((n_customers, window_days), dtype=np.int32)
+        self.window_sums = np.zeros((n_customers, window_days), dtype=np.float32)
+        self._bucket_days = np.full(window_days, -1, dtype=np.int64)
+        self.current_day = -1
+
+        self.events_seen = 0
+        self.unknown_events = 0
+
+    def _rows(self, ids):
+        """Map customer ids to state rows, flagging ids we don't know"""
+        pos = np.searchsorted(self._sorted_ids, ids)
+        pos = np.minimum(pos, len(self._sorted_ids) - 1)
+        known = self._sorted_ids[pos] == ids
+        return self._order[pos[known]], known
+
+    def _advance_window(self, day):
+        """Move the window end forward and clear buckets that fell out"""
+        if day <= self.current_day:
+            return
+        self.current_day = day
+        stale = (self._bucket_days >= 0) & (self._bucket_days <= day - self.window_days)
+        if stale.any():
+            self.window_counts[:, stale] = 0
+            self.window_sums[:, stale] = 0
+            self._bucket_days[stale] = -1
+
+    def update(self, chunk):
+        """Fold one chunk of events into the aggregates"""
+        ids = np.asarray(chunk['customer_id'], dtype=np.int64)
+        if len(ids) == 0 or len(self.customer_ids) == 0:
+            self.unknown_events += len(ids)
+            return self
+
+        rows, known = self._rows(ids)
+        categories = np.asarray(chunk['category'], dtype=np.intp)[known]
+        amounts = np.asarray(chunk['amount'], dtype=np.float64)[known]
+        days = np.asarray(chunk['timestamp'], dtype=np.int64)[known] // SECONDS_PER_DAY
+
+        self.events_seen += len(ids)
+        self.unknown_events += int((~known).sum())
+        if len(rows) == 0:
+            return self
+
+        np.add.at(self.counts, (rows, categories), 1)
+        np.add.at(self.sums, (rows, categories), amounts)
+
+        self._advance_window(int(days.max()))
+        recent = days > self.current_day - self.window_days
+        slots = days[recent] % self.window_days
+        self._bucket_days[slots] = days[recent]
+        np.add.at(self.window_counts, (rows[recent], slots), 1)
+        np.add.at(self.window_sums, (rows[recent], slots), amounts[recent])
+        return self
+
+    def to_frame(self):
+        """Per-customer feature frame, one row per customer in input order"""
+        features = {'customer_id': self.customer_ids}
+        for i, category in enumerate(SPENDING_CATEGORIES):
+            features[category] = self.counts[:, i]
+        for i, category in enumerate(SPENDING_CATEGORIES):
+            features[f'{category}_amount'] = self.sums[:, i]
+
+        frame = pd.DataFrame(features)
+        frame['total_spending'] = frame[SPENDING_COLS].sum(axis=1)
+        for col in SPENDING_COLS:
+            frame[f'{col}_ratio'] = frame[col] / frame['total_spending'].replace(0, 1)
+
+        frame['total_amount'] = self.sums.sum(axis=1)
+        frame['avg_ticket'] = frame['total_amount'] / self.counts.sum(axis=1).clip(min=1)
+        frame[f'transactions_{self.window_days}d'] = self.window_counts.sum(axis=1)
+        frame[f'amount_{self.window_days}d'] = self.window_sums.sum(axis=1, dtype=np.float64)
+        return frame
+
+
+def iter_event_chunks(events, chunk_size=1_000_000):
+    """Yield event chunks from a file path, an array or an iterator of chunks"""
+    if isinstance(events, (str, os.PathLike)):
+        events = load_transaction_events(events)
+    if isinstance(events, np.ndarray):
+        for start in range(0, len(events), chunk_size):
+            yield events[start:start + chunk_size]
+    else:
+        yield from events
+
+
+def aggregate_transactions(customers, events, chunk_size=1_000_000, window_days=30):
+    """Replace the aggregate spending columns of ``customers`` with values
+    computed from transaction events.
+
+    The result keeps every other customer column, so it can be passed straight
+    to BankingCustomerAnalytics.
+    """
+    aggregator = TransactionAggregator(customers['customer_id'], window_days=window_days)
+    for chunk in iter_event_chunks(events, chunk_size):
+        aggregator.update(chunk)
+
+    result = customers.copy()
+    features = aggregator.to_frame()
+    for col in features.columns.drop('customer_id'):
+        result[col] = features[col].to_numpy()
+    return result
@@ -3,43 +3,159 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.ensemble import IsolationForest
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
+import time
+from scipy.optimize import linear_sum_assignment
+from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score
+from .sampling import income_band, stratified_sample
+from .data_generation import PRODUCT_OPTIONS
+from .sentiment import BatchSentimentAnalyzer
+from .monitoring import DriftMonitor
 
-# Initialize NLTK
-nltk.download('vader_lexicon', quiet=True)
+# Spending categories that make up total_spending and the *_ratio columns
+SPENDING_COLS = ['groceries', 'dining', 'shopping', 'travel', 'luxury']
+
+# Features used for segmentation and anomaly detection
+SEGMENT_FEATURES = [
+    'income', 'credit_score', 'checking_balance',
+    'savings_balance', 'online_purchases', 'app_logins',
+    'investment_balance', 'digital_engagement_score',
+    'ecommerce_activity_score', 'clv'
+]
+
+DEFAULT_SEGMENT_NAMES = {
+    0: 'Mass Market',
+    1: 'Digital Natives',
+    2: 'Affluent Investors',
+    3: 'Traditional Savers',
+    4: 'High-Potential'
+}
+
+# Churn-risk formula: each signal is scaled to 0..1 (1 = worst) and weighted
+# into a logit. Weights reflect how strongly each signal precedes attrition.
+CHURN_WEIGHTS = {
+    'nps_score': 1.5,
+    'csat': 1.0,
+    'complaints': 1.2,
+    'customer_service_contacts': 0.6,
+    'abandoned_carts': 0.4,
+    'app_logins': 0.8,
+    'sentiment': 1.0
+}
+CHURN_INTERCEPT = -4.0
+CHURN_THRESHOLDS = (0.3, 0.6)  # Low / Medium / High cut-offs
+
+# Metrics ranked against peers, overall and within the customer's segment
+PEER_METRICS = ['debt_to_income', 'savings_ratio', 'investment_ratio',
+                'credit_score', 'digital_engagement_score', 'clv']
+
+def score_churn_risk(df):
+    """Churn probability for every row in one vectorized pass"""
+    def col(name):
+        return df[name].to_numpy(dtype=np.float64)
+    
+    signals = {
+        'nps_score': (10 - col('nps_score')) / 10,
+        'csat': (5 - col('csat')) / 4,
+        'complaints': np.minimum(col('complaints') / 3, 1),
+        'customer_service_contacts': np.minimum(col('customer_service_contacts') / 2, 1),
+        'abandoned_carts': np.minimum(col('abandoned_carts') / 4, 1),
+        'app_logins': 1 - np.minimum(col('app_logins') / 150, 1),
+        'sentiment': (1 - col('sentiment')) / 2
+    }
+    logit = np.full(len(df), CHURN_INTERCEPT)
+    for name, weight in CHURN_WEIGHTS.items():
+        logit += weight * np.clip(np.nan_to_num(signals[name], nan=0.5), 0, 1)
+    return 1.0 / (1.0 + np.exp(-logit))
+
+def churn_risk_category(risk):
+    """Low / Medium / High bucket of churn probabilities"""
+    low, high = CHURN_THRESHOLDS
+    return np.where(risk >= high, 'High', np.where(risk >= low, 'Medium', 'Low'))
+
+def percentile_ranks(values, groups=None):
+    """Percentile (0-100, uint8) of every value among its group.
+    
+    The percentile is the share of the group at or below the value. All
+    groups are ranked together by one sort on (group, value).
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    groups = np.zeros(len(values), dtype=np.intp) if groups is None else np.asarray(groups, dtype=np.intp)
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    order = np.lexsort((values, groups))
+    sorted_groups = groups[order]
+    sorted_values = values[order]
+    
+    # Tied values share the position of the last of their run
+    run_end = np.r_[(sorted_groups[1:] != sorted_groups[:-1]) | (sorted_values[1:] != sorted_values[:-1]), True]
+    last_in_run = np.flatnonzero(run_end)[np.r_[0, np.cumsum(run_end)[:-1]]]
+    sizes = np.bincount(sorted_groups)
+    starts = np.cumsum(sizes) - sizes
+    at_or_below = last_in_run + 1 - starts[sorted_groups]
+    
+    ranks = np.empty(len(values), dtype=np.uint8)
+    ranks[order] = (100 * at_or_below // sizes[sorted_groups]).astype(np.uint8)
+    return ranks
+
+def assign_models(features, scaler, kmeans, anomaly_detector, chunk_size=1_000_000):
+    """Scale features and assign segments and anomaly flags in chunks.
+    
+    Returns the scaled matrix, segment labels and anomaly predictions
+    (-1 for anomalies) for every row of ``features``.
+    """
+    scaled = np.empty(features.shape, dtype=np.float64)
+    segments = np.empty(len(features), dtype=np.int32)
+    anomaly_scores = np.empty(len(features), dtype=np.int64)
+    for start in range(0, len(features), chunk_size):
+        stop = start + chunk_size
+        # Convert one chunk at a time; only the scaled output is full size
+        values = features.iloc[start:stop].fillna(0).to_numpy(dtype=np.float64)
+        scaled[start:stop] = scaler.transform(values)
+        segments[start:stop] = kmeans.predict(scaled[start:stop])
+        anomaly_scores[start:stop] = anomaly_detector.predict(scaled[start:stop])
+    return scaled, segments, anomaly_scores
 
 class BankingCustomerAnalytics:
-    def __init__(self, df):
+    def __init__(self, df, training_sample=None, chunk_size=1_000_000, fit=True):
+        """``training_sample`` switches to sample-then-assign training: the
+        scaler and models are fitted on a stratified sample of that many
+        customers and then applied to everyone in chunks of ``chunk_size``.
+        With ``fit=False`` only preprocessing and feature creation run."""
         self.df = df.copy()
+        self.model_version = 0
+        self.stats_version = 0
+        self.training_sample = training_sample
+        self.chunk_size = chunk_size
         self._preprocess_data()
         self._create_features()
-        self._train_models()
+        self._score_churn_risk()
+        if fit:
+            self._train_models()
         
     def _preprocess_data(self):
         """Data cleaning and preprocessing"""
-        # Sentiment Analysis
-        sia = SentimentIntensityAnalyzer()
-        banking_lexicon = {
-            'improvement': -0.5, 'excellent': 2.0, 'confusing': -1.5,
-            'best': 1.8, 'better': 0.5, 'needs': -0.7, 'love': 1.5,
-            'slow': -1.0, 'intuitive': 1.2, 'low': -0.8, 'great': 1.3
-        }
-        sia.lexicon.update(banking_lexicon)
-        
-        self.df['sentiment'] = self.df['feedback'].apply(lambda x: sia.polarity_scores(x)['compound'])
+        # Sentiment Analysis, scored for the whole column in one batch
+        self.df['sentiment'] = BatchSentimentAnalyzer().compound(self.df['feedback'])
         self.df['sentiment_category'] = np.where(
             self.df['sentiment'] < -0.5, 'Negative',
             np.where(self.df['sentiment'] > 0.5, 'Positive', 'Neutral')
         )
         
-        # Create product indicator columns
-        all_products = set()
-        for products in self.df['products_used']:
-            all_products.update(products)
-        
-        for product in all_products:
-            self.df[f'has_{product}'] = self.df['products_used'].apply(lambda x: product in x)
+        # Create product indicator columns, straight from the bitmask when the
+        # typed loader provided one
+        if 'products_mask' in self.df.columns:
+            mask = self.df['products_mask'].to_numpy()
+            for bit, product in enumerate(PRODUCT_OPTIONS):
+                has_product = (mask >> bit) & 1 == 1
+                if has_product.any():
+                    self.df[f'has_{product}'] = has_product
+        else:
+            all_products = set()
+            for products in self.df['products_used']:
+                all_products.update(products)
+            
+            for product in all_products:
+                self.df[f'has_{product}'] = self.df['products_used'].apply(lambda x: product in x)
     
     def _create_features(self):
         """Create financial and behavioral features"""
@@ -64,9 +180,8 @@ class BankingCustomerAnalytics:
         )
         
         # Spending Categories
-        spending_cols = ['groceries', 'dining', 'shopping', 'travel', 'luxury']
-        self.df['total_spending'] = self.df[spending_cols].sum(axis=1)
-        for col in spending_cols:
+        self.df['total_spending'] = self.df[SPENDING_COLS].sum(axis=1)
+        for col in SPENDING_COLS:
             self.df[f'{col}_ratio'] = self.df[col] / self.df['total_spending'].replace(0, 1)
         
         # Customer Lifetime Value (simplified)
@@ -76,38 +191,179 @@ class BankingCustomerAnalytics:
             self.df['digital_engagement_score'] * 10  # Engagement multiplier
         )
     
+    def _score_churn_risk(self):
+        """Retention signal from satisfaction and engagement"""
+        self.df['churn_risk'] = score_churn_risk(self.df)
+        self.df['churn_risk_category'] = churn_risk_category(self.df['churn_risk'].to_numpy())
+    
     def _train_models(self):
         """Train machine learning models"""
-        # Features for segmentation
-        segment_features = [
-            'income', 'credit_score', 'checking_balance',
-            'savings_balance', 'online_purchases', 'app_logins',
-            'investment_balance', 'digital_engagement_score',
-            'ecommerce_activity_score', 'clv'
-        ]
+        if self.training_sample is not None and self.training_sample < len(self.df):
+            self._train_models_on_sample()
+            return
         
+        timings = {}
+        start = time.perf_counter()
         # Scale features
         self.scaler = StandardScaler()
-        scaled_features = self.scaler.fit_transform(self.df[segment_features].fillna(0))
+        self.scaled_features = self.scaler.fit_transform(self.df[SEGMENT_FEATURES].fillna(0))
         
         # Clustering
-        self.kmeans = KMeans(n_clusters=5, random_state=42, n_init=20)
-        self.df['segment'] = self.kmeans.fit_predict(scaled_features)
+        kmeans = KMeans(n_clusters=5, random_state=42, n_init=20)
+        segments = kmeans.fit_predict(self.scaled_features)
         
-        # Name segments
-        self.segment_names = {
-            0: 'Mass Market',
-            1: 'Digital Natives',
-            2: 'Affluent Investors',
-            3: 'Traditional Savers',
-            4: 'High-Potential'
+        # Anomaly detection
+        self.anomaly_detector = IsolationForest(contamination=0.05, random_state=42)
+        anomaly_scores = self.anomaly_detector.fit_predict(self.scaled_features)
+        timings['fit'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.set_segmentation(kmeans, segments)
+        self.df['anomaly_score'] = anomaly_scores
+        self.df['is_anomaly'] = self.df['anomaly_score'] == -1
+        timings['assign'] = time.perf_counter() - start
+        
+        self.training_report = {
+            'mode': 'full',
+            'sample_size': len(self.df),
+            'population': len(self.df),
+            'timings': timings
         }
-        self.df['segment_name'] = self.df['segment'].map(self.segment_names)
         
-        # Anomaly detection
+    def _training_strata(self):
+        """Stratification frame: state, life stage and income band"""
+        return pd.DataFrame({
+            'state': self.df['state'].to_numpy(),
+            'life_stage': self.df['life_stage'].to_numpy(),
+            'income_band': income_band(self.df['income']).to_numpy()
+        })
+    
+    def _fit_models_on_sample(self, timings):
+        """Fit the scaler, KMeans and IsolationForest on a stratified sample.
+        
+        Returns the fitted KMeans and the sample size; the scaler and anomaly
+        detector are stored on the instance.
+        """
+        start = time.perf_counter()
+        sample_idx = stratified_sample(self._training_strata(), self.training_sample,
+                                       ['state', 'life_stage', 'income_band'])
+        sample = self.df[SEGMENT_FEATURES].iloc[sample_idx].fillna(0).to_numpy(dtype=np.float64)
+        timings['sampling'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.scaler = StandardScaler()
+        scaled_sample = self.scaler.fit_transform(sample)
+        kmeans = KMeans(n_clusters=5, random_state=42, n_init=20).fit(scaled_sample)
         self.anomaly_detector = IsolationForest(contamination=0.05, random_state=42)
-        self.df['anomaly_score'] = self.anomaly_detector.fit_predict(scaled_features)
+        self.anomaly_detector.fit(scaled_sample)
+        timings['fit'] = time.perf_counter() - start
+        return kmeans, len(sample_idx)
+    
+    def _train_models_on_sample(self):
+        """Fit on a stratified sample, then assign the full population"""
+        timings = {}
+        kmeans, sample_size = self._fit_models_on_sample(timings)
+        
+        start = time.perf_counter()
+        self.scaled_features, segments, anomaly_scores = assign_models(
+            self.df[SEGMENT_FEATURES], self.scaler, kmeans, self.anomaly_detector, self.chunk_size
+        )
+        self.set_segmentation(kmeans, segments)
+        self.df['anomaly_score'] = anomaly_scores
         self.df['is_anomaly'] = self.df['anomaly_score'] == -1
+        timings['assign'] = time.perf_counter() - start
+        
+        self.training_report = {
+            'mode': 'sample',
+            'sample_size': sample_size,
+            'population': len(self.df),
+            'timings': timings
+        }
+    
+    def segment_stability(self, n_init=20):
+        """Compare the current segmentation with a fit on the full data.
+        
+        Refits the scaler, KMeans and IsolationForest on every customer and
+        reports label agreement (ARI, NMI, and the share of customers in the
+        same segment after matching cluster ids) and anomaly flag agreement.
+        """
+        start = time.perf_counter()
+        scaled = StandardScaler().fit_transform(self.df[SEGMENT_FEATURES].fillna(0))
+        full_segments = KMeans(
+            n_clusters=self.kmeans.n_clusters, random_state=42, n_init=n_init
+        ).fit_predict(scaled)
+        full_anomalies = IsolationForest(
+            contamination=0.05, random_state=42
+        ).fit_predict(scaled) == -1
+        full_fit_seconds = time.perf_counter() - start
+        
+        segments = self.df['segment'].to_numpy()
+        n_clusters = max(segments.max(), full_segments.max()) + 1
+        contingency = np.zeros((n_clusters, n_clusters), dtype=np.int64)
+        np.add.at(contingency, (segments, full_segments), 1)
+        rows, cols = linear_sum_assignment(-contingency)
+        
+        return {
+            'adjusted_rand_index': adjusted_rand_score(full_segments, segments),
+            'normalized_mutual_info': normalized_mutual_info_score(full_segments, segments),
+            'matched_share': float(contingency[rows, cols].sum() / len(segments)),
+            'anomaly_agreement': float((full_anomalies == self.df['is_anomaly'].to_numpy()).mean()),
+            'full_fit_seconds': full_fit_seconds
+        }
+    
+    def set_segmentation(self, kmeans, labels):
+        """Install a fitted clustering model and its segment labels"""
+        self.kmeans = kmeans
+        self.df['segment'] = labels
+        
+        # Name segments, falling back to numbered names beyond the defaults
+        self.segment_names = {
+            i: DEFAULT_SEGMENT_NAMES.get(i, f'Segment {i}')
+            for i in range(kmeans.n_clusters)
+        }
+        self.df['segment_name'] = self.df['segment'].map(self.segment_names)
+        self._rank_peers()
+        
+        # Reference distributions that new batches are compared against
+        self.drift_monitor = DriftMonitor(
+            self.scaler, kmeans, self.scaled_features, labels, SEGMENT_FEATURES, self.segment_names
+        )
+        
+        # Refitting changes every customer's scores, so cached results keyed on
+        # the old version must not be reused
+        self.model_version += 1
+        
+    def _rank_peers(self):
+        """Percentile columns and segment medians for peer comparison.
+        
+        Adds ``<metric>_pct`` (overall) and ``<metric>_segment_pct`` (within
+        the segment) as uint8 columns, and ``peer_benchmarks``, the median of
+        every metric per segment name.
+        """
+        segments = self.df['segment'].to_numpy()
+        for metric in PEER_METRICS:
+            values = self.df[metric].to_numpy()
+            self.df[f'{metric}_pct'] = percentile_ranks(values)
+            self.df[f'{metric}_segment_pct'] = percentile_ranks(values, segments)
+        medians = self.df.groupby('segment_name')[PEER_METRICS].median()
+        self.peer_benchmarks = medians.to_dict(orient='index')
+        # Segment statistics feed cached results of every customer in the segment
+        self.stats_version += 1
+
+    def refresh_peer_stats(self):
+        """Recompute percentile ranks and segment medians after customer rows
+        change without a refit"""
+        self._rank_peers()
+        
+    def check_drift(self, new_df):
+        """Fold a batch of new customers into the drift monitor and report.
+        
+        Counts accumulate across calls until ``drift_monitor.reset()``; see
+        DriftMonitor.report for the result, including ``needs_refit``.
+        """
+        batch = BankingCustomerAnalytics(new_df, fit=False).df
+        self.drift_monitor.update(batch)
+        return self.drift_monitor.report()
         
     def get_product_recommendations(self, customer_id):
         """Get product recommendations based on similar customers"""
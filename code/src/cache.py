@@ -0,0 +1,119 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class RecommendationCache:
+    """Bounded LRU/TTL cache for per-customer results.
+
+    Entries are keyed by (namespace, customer_id) and tagged with a version
+    string. A lookup with a different version (the customer's row changed or
+    the models were refitted) is treated as a miss and the stale entry is
+    dropped, so only the affected customers are recomputed.
+    """
+
+    def __init__(self, max_entries=10000, ttl=3600, clock=time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, namespace, customer_id, version):
+        """Return the cached value, or None on a miss"""
+        with self._lock:
+            return self._get(namespace, customer_id, version)
+
+    def _get(self, namespace, customer_id, version):
+        key = (namespace, customer_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        entry_version, stored_at, value = entry
+        if entry_version != version:
+            del self._entries[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        if self.ttl is not None and self._clock() - stored_at > self.ttl:
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, namespace, customer_id, version, value):
+        """Store a value, evicting the least recently used entry if full"""
+        key = (namespace, customer_id)
+        with self._lock:
+            self._entries[key] = (version, self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, namespace, customer_id, version, compute):
+        """Return the cached value or compute, store and return it"""
+        value = self.get(namespace, customer_id, version)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(namespace, customer_id, version, value)
+        return value
+
+    def invalidate(self, customer_id=None):
+        """Drop entries for one customer, or everything if no id is given"""
+        with self._lock:
+            if customer_id is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key in self._entries if key[1] == customer_id]
+                for key in keys:
+                    del self._entries[key]
+                dropped = len(keys)
+            self.invalidations += dropped
+            return dropped
+
+    def stats(self):
+        """Return hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+def customer_version(customer, model_version=0, segment_stats=None):
+    """Content hash of a customer row combined with the model version.
+
+    ``segment_stats`` is a dict of the segment-level statistics the cached
+    result was derived from (segment medians, peer benchmarks); they move
+    when other customers change, so they are part of the version too.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(model_version).encode())
+    for key, value in customer.items():
+        digest.update(f"{key}={value!r};".encode())
+    for key, value in sorted((segment_stats or {}).items()):
+        digest.update(f"@{key}={value!r};".encode())
+    return digest.hexdigest()
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ['segment_name', 'state', 'life_stage', 'sentiment_category', 'is_anomaly']
+CUBE_MEASURES = ['clv', 'debt_to_income', 'nps_score', 'income', 'sentiment']
+
+
+class SegmentCube:
+    """Materialized count/sum cube over the portfolio reporting dimensions.
+
+    Every combination of dimension values is one dense cell holding a
+    customer count and the sum of each measure, so roll-ups and slices are
+    sums over a few thousand cells instead of groupbys over every customer.
+    Cells are additive: customers can be added, removed or rescored
+    (remove the old rows, add the new ones) without rebuilding.
+    """
+
+    def __init__(self, dimensions=None, measures=None):
+        self.dimensions = list(dimensions or CUBE_DIMENSIONS)
+        self.measures = list(measures or CUBE_MEASURES)
+        self.categories = {dim: [] for dim in self.dimensions}
+        self._positions = {dim: {} for dim in self.dimensions}
+        shape = (0,) * len(self.dimensions)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.sums = np.zeros((len(self.measures),) + shape)
+
+    @classmethod
+    def from_frame(cls, df, dimensions=None, measures=None):
+        """Build a cube from a customer frame in one pass"""
+        cube = cls(dimensions, measures)
+        cube.add(df)
+        return cube
+
+    def _grow(self, axis, new_size):
+        """Extend one dimension to make room for newly seen values"""
+        pad = [(0, 0)] * self.counts.ndim
+        pad[axis] = (0, new_size - self.counts.shape[axis])
+        self.counts = np.pad(self.counts, pad)
+        self.sums = np.pad(self.sums, [(0, 0)] + pad)
+
+    def _codes(self, df):
+        """Cell coordinates of every row, registering unseen values"""
+        codes = []
+        for axis, dim in enumerate(self.dimensions):
+            inverse, uniques = pd.factorize(df[dim].to_numpy(), use_na_sentinel=False)
+            positions = self._positions[dim]
+            for value in uniques:
+                if value not in positions:
+                    positions[value] = len(self.categories[dim])
+                    self.categories[dim].append(value)
+            if len(self.categories[dim]) > self.counts.shape[axis]:
+                self._grow(axis, len(self.categories[dim]))
+            lookup = np.array([positions[value] for value in uniques], dtype=np.intp)
+            codes.append(lookup[inverse])
+        return codes
+
+    def add(self, df, sign=1):
+        """Fold customers into the cube (``sign=-1`` removes them)"""
+        if len(df) == 0:
+            return self
+        flat = np.ravel_multi_index(self._codes(df), self.counts.shape)
+        size = self.counts.size
+        self.counts += sign * np.bincount(flat, minlength=size).reshape(self.counts.shape)
+        for i, measure in enumerate(self.measures):
+            weights = df[measure].fillna(0).to_numpy(dtype=np.float64)
+            self.sums[i] += sign * np.bincount(flat, weights=weights, minlength=size).reshape(self.counts.shape)
+        return self
+
+    def remove(self, df):
+        """Take customers out of the cube"""
+        return self.add(df, sign=-1)
+
+    def update(self, old_rows, new_rows):
+        """Apply a rescore: remove the old version of rows, add the new one"""
+        self.remove(old_rows)
+        return self.add(new_rows)
+
+    def query(self, by=(), where=None):
+        """Roll up to the ``by`` dimensions after slicing on ``where``.
+
+        ``where`` maps dimensions to a value or list of values. Returns a
+        frame indexed by the ``by`` dimensions with the customer count, the
+        sum and average of every measure, dropping empty cells.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        counts, sums = self.counts, self.sums
+        labels = {dim: self.categories[dim] for dim in by}
+        for dim, values in (where or {}).items():
+            axis = self.dimensions.index(dim)
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            keep = [self._positions[dim][v] for v in values if v in self._positions[dim]]
+            if dim in labels:
+                labels[dim] = [self.categories[dim][i] for i in keep]
+            counts = counts.take(keep, axis=axis)
+            sums = sums.take(keep, axis=axis + 1)
+
+        other_axes = tuple(i for i, dim in enumerate(self.dimensions) if dim not in by)
+        counts = counts.sum(axis=other_axes)
+        sums = sums.sum(axis=tuple(axis + 1 for axis in other_axes))
+
+        # Reorder the remaining axes to follow ``by``
+        remaining = [dim for dim in self.dimensions if dim in by]
+        order = [remaining.index(dim) for dim in by]
+        counts = counts.transpose(order)
+        sums = sums.transpose([0] + [axis + 1 for axis in order])
+
+        result = {'customers': counts.ravel()}
+        for i, measure in enumerate(self.measures):
+            result[f'{measure}_sum'] = sums[i].ravel()
+            result[f'avg_{measure}'] = sums[i].ravel() / np.maximum(counts.ravel(), 1)
+
+        if by:
+            index = pd.MultiIndex.from_product([labels[dim] for dim in by], names=by)
+            if len(by) == 1:
+                index = index.get_level_values(0)
+        else:
+            index = None
+        frame = pd.DataFrame(result, index=index)
+        return frame[frame['customers'] > 0]
+
+    def total(self):
+        """Portfolio-wide count, sums and averages as a Series"""
+        totals = self.query()
+        if totals.empty:
+            return pd.Series(0, index=totals.columns, dtype=np.float64)
+        return totals.iloc[0]
@@ -1,20 +1,41 @@
+import asyncio
 from IPython.display import display, HTML
-from .visualization import create_spending_profile, create_financial_health_radar, create_trend_projection
+from .visualization import (
+    create_spending_profile, create_financial_health_radar, create_trend_projection, ordinal, peer_percentile_text
+)
 from .recommendations import BankingRecommendationEngine
+from .cache import customer_version
 
-def generate_dashboard(customer_id, bank_customers, analytics):
-    """Generate customer dashboard"""
-    try:
-        customer = bank_customers[bank_customers['customer_id'] == customer_id].iloc[0]
-    except IndexError:
-        display(HTML("""<div style="color: red; padding: 20px; border: 1px solid red;">
-                      Customer not found</div>"""))
-        return
-    
-    # Get recommendations
-    recommendation_engine = BankingRecommendationEngine(analytics)
-    recommendations = recommendation_engine.generate_recommendations(customer_id)
-    
+DASHBOARD_SPENDING_COLS = ['groceries', 'dining', 'shopping', 'bills', 'travel']
+
+# Dashboard sections in display order; charts are cached per customer
+SECTIONS = ['header', 'spending', 'health', 'trend', 'insights', 'recommendations']
+CHART_SECTIONS = ['spending', 'health', 'trend']
+
+NOT_FOUND_HTML = """<div style="color: red; padding: 20px; border: 1px solid red;">
+                      Customer not found</div>"""
+SECTION_HEADINGS = {
+    'spending': "<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Financial Overview</h3>",
+    'trend': "<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Financial Projections</h3>"
+}
+INSIGHTS_HEADING = "<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Customer Insights</h3>"
+RECOMMENDATIONS_HEADING = "<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Personalized Recommendations</h3>"
+
+def _chart_jobs(customer, peer_benchmark=None):
+    """Chart builders as (function, args); plain functions so a process pool can run them"""
+    return {
+        'spending': (create_spending_profile, (customer, DASHBOARD_SPENDING_COLS)),
+        'health': (create_financial_health_radar, (customer, peer_benchmark)),
+        'trend': (create_trend_projection, (customer,))
+    }
+
+def _peer_note(customer, metric):
+    """Small grey percentile note, empty when ranks aren't available"""
+    text = peer_percentile_text(customer, metric)
+    return f'<span style="font-size: 12px; color: #607D8B;">({text})</span>' if text else ''
+
+def _header_html(customer, customer_id):
+    """Identity, demographics and financial summary banner"""
     # Determine life stage icon
     life_stage_icons = {
         'young_professional': '👔',
@@ -26,8 +47,14 @@ def generate_dashboard(customer_id, bank_customers, analytics):
         'single_professional': '💼'
     }
     
+    # Peer standing of the customer's lifetime value, if ranks were computed
+    clv_peer = ''
+    if 'clv_segment_pct' in customer:
+        clv_peer = (f"<div style='font-size: 11px; opacity: 0.8;'>"
+                    f"{ordinal(customer['clv_segment_pct'])} percentile in segment</div>")
+    
     # Header with enhanced demographic information and visual elements
-    display(HTML(f"""
+    return f"""
     <div style="background: linear-gradient(135deg, #1a2980, #26d0ce); 
         padding: 25px; border-radius: 10px; color: white; margin-bottom: 20px;
         box-shadow: 0 4px 8px rgba(0,0,0,0.1); position: relative; overflow: hidden;">
@@ -124,36 +151,18 @@ def generate_dashboard(customer_id, bank_customers, analytics):
                     <div style="background: rgba(255,255,255,0.1); padding: 10px; border-radius: 5px;">
                         <div style="font-size: 11px; opacity: 0.8;">CLV [Customer Lifetime Value]</div>
                         <div style="font-size: 18px; font-weight: bold;">${customer['clv']/1000:.0f}K</div>
+                        {clv_peer}
                     </div>
                 </div>
             </div>
         </div>
     </div>
-    """))
-    
-    # First Row - Financial Overview
-    display(HTML("<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Financial Overview</h3>"))
-    
-    # Create and show visualizations
-    spending_cols = ['groceries', 'dining', 'shopping', 'bills', 'travel']
-    spending_fig = create_spending_profile(customer, spending_cols)
-    if spending_fig:
-        spending_fig.show()
-    
-    health_fig = create_financial_health_radar(customer)
-    health_fig.show()
-    
-    # Second Row - Projections
-    display(HTML("<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Financial Projections</h3>"))
-    trend_fig = create_trend_projection(customer)
-    trend_fig.show()
-    
-    # Third Row - Customer Insights
-    display(HTML("<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Customer Insights</h3>"))
-    
+    """
+
+def _insights_html(customer, flagged):
+    """Financial snapshot, behavioral and experience cards"""
     # Get primary spending category
-    spending_cols = ['groceries', 'dining', 'shopping', 'bills', 'travel']
-    primary_spending = max(spending_cols, key=lambda x: customer.get(x, 0))
+    primary_spending = max(DASHBOARD_SPENDING_COLS, key=lambda x: customer.get(x, 0))
     
     insights_html = f"""
     <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 20px; margin-bottom: 20px;">
@@ -162,12 +171,13 @@ def generate_dashboard(customer_id, bank_customers, analytics):
             <p><strong>Total Assets:</strong> ${customer['total_assets']:,.0f}</p>
             <p><strong>Liquid Assets:</strong> ${customer['liquid_assets']:,.0f}</p>
             <p><strong>Total Debt:</strong> ${customer['mortgage_balance'] + customer['credit_card_balance']:,.0f}</p>
-            <p><strong>Debt-to-Income:</strong> {customer['debt_to_income']:.2f} {'🚩' if customer['debt_to_income'] > 0.4 else ''}</p>
+            <p><strong>Debt-to-Income:</strong> {customer['debt_to_income']:.2f} {'🚩' if customer['debt_to_income'] > 0.4 else ''} {_peer_note(customer, 'debt_to_income')}</p>
+            <p><strong>Savings Ratio:</strong> {customer['savings_ratio']:.2f} {_peer_note(customer, 'savings_ratio')}</p>
         </div>
         
         <div style="background: #e8f5e9; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.05);">
             <h4 style="margin-top: 0; color: #2e7d32; border-bottom: 1px solid #c8e6c9; padding-bottom: 8px;">Behavioral Insights</h4>
-            <p><strong>Digital Engagement:</strong> {customer['digital_engagement_score']:.1f}/100</p>
+            <p><strong>Digital Engagement:</strong> {customer['digital_engagement_score']:.1f}/100 {_peer_note(customer, 'digital_engagement_score')}</p>
             <p><strong>E-commerce Activity:</strong> {customer['ecommerce_activity_score']:.1f}/100</p>
             <p><strong>Primary Spending:</strong> {primary_spending.title()}</p>
             <p><strong>Products Used:</strong> {len(customer['products_used'])} of 8</p>
@@ -179,73 +189,218 @@ def generate_dashboard(customer_id, bank_customers, analytics):
             <p><strong>Sentiment:</strong> <span style="color: {'#F44336' if customer['sentiment_category'] == 'Negative' else '#FFC107' if customer['sentiment_category'] == 'Neutral' else '#4CAF50'}">
                 {customer['sentiment_category']}</span></p>
             <p><strong>Feedback:</strong> "{customer['feedback']}"</p>
-            <p><strong>Anomaly Detection:</strong> {'⚠️ Flagged' if customer['is_anomaly'] else '✅ Normal'}</p>
+            <p><strong>Churn Risk:</strong> <span style="color: {'#F44336' if customer.get('churn_risk_category') == 'High' else '#FFC107' if customer.get('churn_risk_category') == 'Medium' else '#4CAF50'}">
+                {customer.get('churn_risk_category', 'n/a')} ({customer.get('churn_risk', 0):.0%})</span></p>
+            <p><strong>Anomaly Detection:</strong> {'⚠️ Flagged' if flagged else '✅ Normal'}</p>
         </div>
     </div>
     """
-    display(HTML(insights_html))
+    return INSIGHTS_HEADING + insights_html
+
+def _recommendations_html(recommendations):
+    """Recommendation cards and alerts, empty without recommendations"""
+    if not recommendations:
+        return ''
     
-    # Recommendations section remains the same...
-    if recommendations:
-        display(HTML("<h3 style='color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 5px;'>Personalized Recommendations</h3>"))
-        
-        def create_rec_card(title, recs, icon, color):
-            if recs:
-                return f"""
-                <div style="background: {color}08; border-left: 4px solid {color}; padding: 15px; border-radius: 5px; margin-bottom: 15px;
-                            box-shadow: 0 2px 4px rgba(0,0,0,0.05);">
-                    <h4 style="margin-top: 0; color: {color}; display: flex; align-items: center; gap: 8px;">
-                        <span style="font-size: 20px;">{icon}</span> {title}
-                    </h4>
-                    <ul style="padding-left: 20px; margin-bottom: 0;">{''.join(f'<li style="margin-bottom: 8px;">{rec}</li>' for rec in recs)}</ul>
-                </div>
-                """
-            return ""
-        
-        rec_html = "<div style='display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px;'>"
-        
-        rec_html += create_rec_card(
-            "Financial Products", 
-            recommendations['financial_products'], 
-            "💰", "#2196F3"
-        )
-        rec_html += create_rec_card(
-            "Digital Services", 
-            recommendations['digital_services'], 
-            "📱", "#4CAF50"
-        )
-        rec_html += create_rec_card(
-            "Wealth Management", 
-            recommendations['wealth_management'], 
-            "📈", "#9C27B0"
-        )
-        rec_html += create_rec_card(
-            "Credit Optimization", 
-            recommendations['credit_optimization'], 
-            "💳", "#FF9800"
-        )
-        rec_html += create_rec_card(
-            "Financial Education", 
-            recommendations['financial_education'], 
-            "🎓", "#00BCD4"
-        )
-        rec_html += create_rec_card(
-            "Banking Habits", 
-            recommendations['banking_habits'], 
-            "🔄", "#607D8B"
-        )
-        
-        # Alerts at the bottom spanning full width
-        if recommendations['alerts']:
-            rec_html += f"""
-            <div style="grid-column: span 2; background: #ffebee; border-left: 4px solid #f44336; 
-                        padding: 15px; border-radius: 5px; margin-top: 10px;">
-                <h4 style="margin-top: 0; color: #f44336; display: flex; align-items: center; gap: 8px;">
-                    <span style="font-size: 20px;">⚠️</span> Important Alerts
+    def create_rec_card(title, recs, icon, color):
+        if recs:
+            return f"""
+            <div style="background: {color}08; border-left: 4px solid {color}; padding: 15px; border-radius: 5px; margin-bottom: 15px;
+                        box-shadow: 0 2px 4px rgba(0,0,0,0.05);">
+                <h4 style="margin-top: 0; color: {color}; display: flex; align-items: center; gap: 8px;">
+                    <span style="font-size: 20px;">{icon}</span> {title}
                 </h4>
-                <ul style="padding-left: 20px; margin-bottom: 0;">{''.join(f'<li style="margin-bottom: 8px; color: #b71c1c;">{rec}</li>' for rec in recommendations['alerts'])}</ul>
+                <ul style="padding-left: 20px; margin-bottom: 0;">{''.join(f'<li style="margin-bottom: 8px;">{rec}</li>' for rec in recs)}</ul>
             </div>
             """
-        
-        rec_html += "</div>"
-        display(HTML(rec_html))
+        return ""
+    
+    rec_html = "<div style='display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px;'>"
+    
+    rec_html += create_rec_card(
+        "Financial Products", 
+        recommendations['financial_products'], 
+        "💰", "#2196F3"
+    )
+    rec_html += create_rec_card(
+        "Digital Services", 
+        recommendations['digital_services'], 
+        "📱", "#4CAF50"
+    )
+    rec_html += create_rec_card(
+        "Wealth Management", 
+        recommendations['wealth_management'], 
+        "📈", "#9C27B0"
+    )
+    rec_html += create_rec_card(
+        "Credit Optimization", 
+        recommendations['credit_optimization'], 
+        "💳", "#FF9800"
+    )
+    rec_html += create_rec_card(
+        "Financial Education", 
+        recommendations['financial_education'], 
+        "🎓", "#00BCD4"
+    )
+    rec_html += create_rec_card(
+        "Banking Habits", 
+        recommendations['banking_habits'], 
+        "🔄", "#607D8B"
+    )
+    
+    # Alerts at the bottom spanning full width
+    if recommendations['alerts']:
+        rec_html += f"""
+        <div style="grid-column: span 2; background: #ffebee; border-left: 4px solid #f44336; 
+                    padding: 15px; border-radius: 5px; margin-top: 10px;">
+            <h4 style="margin-top: 0; color: #f44336; display: flex; align-items: center; gap: 8px;">
+                <span style="font-size: 20px;">⚠️</span> Important Alerts
+            </h4>
+            <ul style="padding-left: 20px; margin-bottom: 0;">{''.join(f'<li style="margin-bottom: 8px; color: #b71c1c;">{rec}</li>' for rec in recommendations['alerts'])}</ul>
+        </div>
+        """
+    
+    rec_html += "</div>"
+    return RECOMMENDATIONS_HEADING + rec_html
+
+def _find_customer(customer_id, bank_customers, engine):
+    """Customer row, via the engine's id index when it covers the same frame"""
+    if engine is not None and bank_customers is engine.analytics.df:
+        return engine.find_customer(customer_id)
+    matches = bank_customers[bank_customers['customer_id'] == customer_id]
+    return matches.iloc[0] if len(matches) else None
+
+def _prepare(customer_id, bank_customers, analytics, cache, engine):
+    """Customer row, engine, peer benchmark and cache version for one request"""
+    customer = _find_customer(customer_id, bank_customers, engine)
+    if customer is None:
+        return None
+    if engine is None:
+        engine = BankingRecommendationEngine(analytics, cache=cache)
+    # Segment medians were computed with the percentile ranks; one dict lookup
+    peer_benchmark = getattr(analytics, 'peer_benchmarks', {}).get(customer['segment_name'])
+    version = None
+    if cache is not None:
+        version = customer_version(customer, getattr(analytics, 'model_version', 0), peer_benchmark)
+    return customer, engine, peer_benchmark, version
+
+def _show_section(name, payload):
+    """Render one section in the notebook"""
+    if name in SECTION_HEADINGS:
+        display(HTML(SECTION_HEADINGS[name]))
+    if isinstance(payload, str):
+        if payload:
+            display(HTML(payload))
+    elif payload is not None:
+        payload.show()
+
+def dashboard_sections(customer_id, bank_customers, analytics, cache=None, engine=None):
+    """Build the dashboard one section at a time, in display order.
+
+    Yields (section, payload) pairs: HTML strings for 'header', 'insights'
+    and 'recommendations', Plotly figures (or None) for the charts, or a
+    single 'error' section if the customer doesn't exist.
+    """
+    prepared = _prepare(customer_id, bank_customers, analytics, cache, engine)
+    if prepared is None:
+        yield 'error', NOT_FOUND_HTML
+        return
+    customer, engine, peer_benchmark, version = prepared
+    
+    yield 'header', _header_html(customer, customer_id)
+    for name, (build, args) in _chart_jobs(customer, peer_benchmark).items():
+        # Chart payload is cached per customer row and model version
+        if cache is None:
+            yield name, build(*args)
+        else:
+            yield name, cache.get_or_compute(f'dashboard_{name}', customer_id, version, lambda: build(*args))
+    yield 'insights', _insights_html(customer, engine.is_anomalous(customer))
+    yield 'recommendations', _recommendations_html(engine.recommend(customer))
+
+def generate_dashboard(customer_id, bank_customers, analytics, cache=None, engine=None):
+    """Generate customer dashboard.
+
+    Pass a prebuilt ``engine`` to reuse its customer index and segment
+    statistics across calls instead of building one per dashboard.
+    """
+    for name, payload in dashboard_sections(customer_id, bank_customers, analytics, cache, engine):
+        _show_section(name, payload)
+
+async def stream_dashboard(customer_id, bank_customers, analytics, cache=None, engine=None, executor=None):
+    """Yield dashboard sections as soon as each one is ready.
+
+    The header and insight cards are plain string formatting and come
+    first. The three charts are then built concurrently on ``executor``
+    (a thread or process pool; the event loop's default thread pool if
+    None), alongside the recommendations, which always run on a thread
+    because the engine holds the whole customer frame. Sections are
+    yielded in completion order as (section, payload) pairs, like
+    dashboard_sections.
+    """
+    loop = asyncio.get_running_loop()
+    prepared = _prepare(customer_id, bank_customers, analytics, cache, engine)
+    if prepared is None:
+        yield 'error', NOT_FOUND_HTML
+        return
+    customer, engine, peer_benchmark, version = prepared
+    
+    yield 'header', _header_html(customer, customer_id)
+    yield 'insights', _insights_html(customer, engine.is_anomalous(customer))
+    
+    async def run(name, pool, build, *args):
+        return name, await loop.run_in_executor(pool, build, *args)
+    
+    pending = []
+    for name, (build, args) in _chart_jobs(customer, peer_benchmark).items():
+        cached = None if cache is None else cache.get(f'dashboard_{name}', customer_id, version)
+        if cached is not None:
+            yield name, cached
+        else:
+            pending.append(asyncio.ensure_future(run(name, executor, build, *args)))
+    pending.append(asyncio.ensure_future(
+        run('recommendations', None, lambda: _recommendations_html(engine.recommend(customer)))
+    ))
+    
+    try:
+        for next_section in asyncio.as_completed(pending):
+            name, payload = await next_section
+            if cache is not None and name in CHART_SECTIONS and payload is not None:
+                cache.put(f'dashboard_{name}', customer_id, version, payload)
+            yield name, payload
+    finally:
+        # The consumer may stop early; don't leave work running for it
+        for task in pending:
+            task.cancel()
+
+def _section_placeholders():
+    """Empty display slot per section, with the fixed headings, in layout order"""
+    handles = {}
+    for name in SECTIONS:
+        if name in SECTION_HEADINGS:
+            display(HTML(SECTION_HEADINGS[name]))
+        handles[name] = display(HTML(''), display_id=True)
+    return handles
+
+async def generate_dashboard_async(customer_id, bank_customers, analytics, cache=None, engine=None, executor=None):
+    """Render the dashboard in the notebook as sections complete.
+
+    The layout is laid out up front as one placeholder per section, in
+    SECTIONS order, and each placeholder is filled in as its section
+    arrives, so completion order never moves a chart away from its
+    heading. Returns the sections as a dict, keyed like SECTIONS.
+    """
+    sections = {}
+    handles = None
+    async for name, payload in stream_dashboard(customer_id, bank_customers, analytics, cache, engine, executor):
+        if name == 'error':
+            _show_section(name, payload)
+            return {name: payload}
+        if handles is None:
+            handles = _section_placeholders()
+        if isinstance(payload, str) or payload is None:
+            payload_view = HTML(payload or '')
+        else:
+            payload_view = payload
+        handles[name].update(payload_view)
+        sections[name] = payload
+    return sections
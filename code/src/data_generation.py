@@ -1,7 +1,45 @@
 import pandas as pd
 import numpy as np
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+# Transaction categories, also used as the category code of transaction events
+SPENDING_CATEGORIES = ['groceries', 'dining', 'shopping', 'bills',
+                       'investments', 'travel', 'gas', 'luxury', 'utilities']
+
+# Fixed-width record layout of the memory-mapped transaction event file
+TRANSACTION_DTYPE = np.dtype([
+    ('customer_id', '<i8'),
+    ('timestamp', '<i8'),     # seconds since the epoch
+    ('category', 'u1'),       # index into SPENDING_CATEGORIES
+    ('amount', '<f4')
+])
+
+PRODUCT_OPTIONS = ['checking', 'savings', 'mortgage', 'credit_card',
+                   'investment', 'auto_loan', 'student_loan', 'debit_card']
+
+LIFE_STAGES = ['young_professional', 'established_family', 'growing_family',
+               'pre_retirement', 'retired', 'new_family', 'single_professional']
+
+# Relative category mix per life stage, in SPENDING_CATEGORIES order
+LIFE_STAGE_CATEGORY_WEIGHTS = {
+    'young_professional':  [3, 5, 4, 2, 1, 3, 2, 1, 2],
+    'established_family':  [6, 3, 3, 4, 2, 2, 3, 1, 3],
+    'growing_family':      [7, 2, 3, 4, 1, 1, 3, 1, 3],
+    'pre_retirement':      [4, 3, 2, 3, 4, 3, 2, 2, 3],
+    'retired':             [5, 2, 2, 4, 2, 3, 1, 1, 4],
+    'new_family':          [6, 2, 4, 3, 1, 1, 3, 1, 3],
+    'single_professional': [3, 5, 4, 2, 2, 3, 2, 2, 2]
+}
+
+# Relative transaction frequency per life stage
+LIFE_STAGE_ACTIVITY = {
+    'young_professional': 1.2, 'established_family': 1.3, 'growing_family': 1.4,
+    'pre_retirement': 1.0, 'retired': 0.7, 'new_family': 1.3, 'single_professional': 1.1
+}
+
+# Typical ticket size per category in dollars, in SPENDING_CATEGORIES order
+CATEGORY_BASE_AMOUNTS = [60, 35, 80, 150, 500, 400, 45, 300, 120]
 
 def generate_synthetic_banking_data(num_customers=500):
     np.random.seed(42)
@@ -35,8 +73,7 @@ def generate_synthetic_banking_data(num_customers=500):
     last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
     
     # Life stages with probabilities
-    life_stages = ['young_professional', 'established_family', 'growing_family', 
-                  'pre_retirement', 'retired', 'new_family', 'single_professional']
+    life_stages = LIFE_STAGES
     life_stage_probs = [0.25, 0.2, 0.15, 0.1, 0.1, 0.1, 0.1]
     
     # Generate synthetic data
@@ -129,10 +166,8 @@ def generate_synthetic_banking_data(num_customers=500):
     credit_card_balances = np.round(incomes * np.random.uniform(0.02, 0.15, num_customers), 2)
     
     # Generate transaction categories as separate columns
-    spending_categories = ['groceries', 'dining', 'shopping', 'bills', 
-                         'investments', 'travel', 'gas', 'luxury', 'utilities']
     transaction_data = {
-        cat: np.random.randint(0, 20, num_customers) for cat in spending_categories
+        cat: np.random.randint(0, 20, num_customers) for cat in SPENDING_CATEGORIES
     }
     
     # Generate social engagement
@@ -172,12 +207,9 @@ def generate_synthetic_banking_data(num_customers=500):
     ]
     
     # Generate products used
-    product_options = ['checking', 'savings', 'mortgage', 'credit_card', 
-                      'investment', 'auto_loan', 'student_loan', 'debit_card']
-    
     def generate_products():
         num_products = random.randint(1, 6)
-        return random.sample(product_options, num_products)
+        return random.sample(PRODUCT_OPTIONS, num_products)
     
     # Create the DataFrame with enhanced demographic data
     data = {
@@ -210,3 +242,85 @@ def generate_synthetic_banking_data(num_customers=500):
     data.update(satisfaction_data)
     
     return pd.DataFrame(data)
+
+def generate_transaction_events(customers, path, days=90, events_per_month=40,
+                                start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                                chunk_size=5_000_000, seed=42):
+    """Generate timestamped transaction events for every customer.
+
+    Event counts scale with income and life stage, the category mix follows the
+    customer's life stage and amounts follow a lognormal around the category's
+    typical ticket size, scaled by income. Events are generated in chunks of
+    roughly ``chunk_size`` rows and written straight into a memory-mapped
+    ``.npy`` file of TRANSACTION_DTYPE records, grouped by customer, so the
+    total volume is bounded by disk rather than RAM.
+
+    Returns the number of events written.
+    """
+    rng = np.random.default_rng(seed)
+    
+    customer_ids = customers['customer_id'].to_numpy(dtype=np.int64)
+    incomes = customers['income'].to_numpy(dtype=np.float64)
+    stage_codes = pd.Categorical(customers['life_stage'], categories=LIFE_STAGES).codes
+    if (stage_codes < 0).any():
+        raise ValueError("Unknown life_stage values in customers")
+    
+    # Relative income drives both frequency and ticket size
+    income_factor = incomes / np.median(incomes)
+    activity = np.array([LIFE_STAGE_ACTIVITY[stage] for stage in LIFE_STAGES])[stage_codes]
+    rates = events_per_month * (days / 30) * np.sqrt(income_factor) * activity
+    counts = rng.poisson(rates)
+    total = int(counts.sum())
+    
+    weights = np.array([LIFE_STAGE_CATEGORY_WEIGHTS[stage] for stage in LIFE_STAGES], dtype=np.float64)
+    cumulative = np.cumsum(weights / weights.sum(axis=1, keepdims=True), axis=1)
+    # Stage s's CDF shifted to [s, s + 1], so one sorted array covers every stage
+    n_categories = len(SPENDING_CATEGORIES)
+    stacked_cdf = (cumulative + np.arange(len(LIFE_STAGES))[:, None]).ravel()
+    log_base = np.log(CATEGORY_BASE_AMOUNTS)
+    start_ts = int(start.timestamp())
+    span = days * 86400
+    
+    events = np.lib.format.open_memmap(path, mode='w+', dtype=TRANSACTION_DTYPE, shape=(total,))
+    
+    # Split customers into blocks holding about chunk_size events each
+    ends = np.cumsum(counts)
+    boundaries = np.searchsorted(ends, np.arange(chunk_size, total, chunk_size), side='right')
+    boundaries = np.unique(np.concatenate([[0], boundaries, [len(customer_ids)]]))
+    
+    offset = 0
+    for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+        block_counts = counts[lo:hi]
+        n = int(block_counts.sum())
+        if n == 0:
+            continue
+        stages = np.repeat(stage_codes[lo:hi], block_counts)
+        
+        chunk = np.empty(n, dtype=TRANSACTION_DTYPE)
+        chunk['customer_id'] = np.repeat(customer_ids[lo:hi], block_counts)
+        chunk['timestamp'] = start_ts + rng.integers(0, span, n)
+        
+        # Inverse-CDF draw against each event's life-stage category mix, one
+        # uniform and one binary search per event
+        u = stages + rng.random(n)
+        category = np.searchsorted(stacked_cdf, u) - stages.astype(np.intp) * n_categories
+        chunk['category'] = np.clip(category, 0, n_categories - 1)
+        
+        log_income = np.repeat(np.log(income_factor[lo:hi]), block_counts)
+        chunk['amount'] = np.round(
+            rng.lognormal(log_base[chunk['category']] + 0.3 * log_income, 0.6), 2
+        )
+        
+        events[offset:offset + n] = chunk
+        offset += n
+    
+    events.flush()
+    del events
+    return total
+
+def load_transaction_events(path):
+    """Open a transaction event file as a read-only memory map"""
+    events = np.load(path, mmap_mode='r')
+    if events.dtype != TRANSACTION_DTYPE:
+        raise ValueError(f"Unexpected transaction record layout: {events.dtype}")
+    return events
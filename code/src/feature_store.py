@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from .analytics import SEGMENT_FEATURES
+
+# Numeric columns persisted to the store, with their on-disk dtype
+STORE_COLUMNS = {
+    'customer_id': '<i8',
+    'income': '<f8',
+    'credit_score': '<i4',
+    'checking_balance': '<f8',
+    'savings_balance': '<f8',
+    'mortgage_balance': '<f8',
+    'credit_card_balance': '<f8',
+    'investment_balance': '<f8',
+    'debt_to_income': '<f8',
+    'savings_ratio': '<f8',
+    'investment_ratio': '<f8',
+    'digital_engagement_score': '<f8',
+    'clv': '<f8',
+    'segment': '<i4',
+    'is_anomaly': '|b1'
+}
+
+SCHEMA_FILE = 'schema.json'
+SCALED_FILE = 'scaled_features.npy'
+# Sorted customer ids and their rows, written only when ids aren't contiguous
+INDEX_FILE = 'customer_index.npy'
+# Names the version directory readers should open
+CURRENT_FILE = 'CURRENT'
+# Versions kept on disk, so a reader attaching during a rewrite still finds its files
+KEEP_VERSIONS = 2
+
+
+def _replace_file(path, write):
+    """Write through a temporary name, then swap it into place"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _current_version(path):
+    """Directory name of the live version, or None for a store in the old flat layout"""
+    try:
+        with open(os.path.join(path, CURRENT_FILE)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def write_feature_store(analytics, path):
+    """Persist the numeric analytics output as memory-mappable arrays.
+
+    Each column becomes its own ``.npy`` file, the scaled segmentation
+    matrix is stored as one 2-D array, ``schema.json`` records the
+    columns, dtypes, row count, segment names and model version, and the
+    customer id to row index is written once next to them. Every write
+    goes to a fresh version directory and the ``CURRENT`` pointer is
+    swapped to it last, so readers see either the old store or the new
+    one, never a mix, and mappings they already hold stay valid.
+    """
+    os.makedirs(path, exist_ok=True)
+    current = _current_version(path)
+    version = f'v{int(current[1:]) + 1 if current else 1:06d}'
+    version_path = os.path.join(path, version)
+    os.makedirs(version_path)
+
+    df = analytics.df
+    columns = {}
+    for name, dtype in STORE_COLUMNS.items():
+        if name not in df.columns:
+            continue
+        np.save(os.path.join(version_path, f'{name}.npy'), df[name].fillna(0).to_numpy(dtype=dtype))
+        columns[name] = dtype
+    np.save(os.path.join(version_path, SCALED_FILE), np.ascontiguousarray(analytics.scaled_features))
+
+    # customer_id -> row lookup; ids are usually a contiguous range
+    ids = df['customer_id'].to_numpy(dtype=np.int64)
+    contiguous = len(ids) > 0 and bool((np.diff(ids) == 1).all())
+    if not contiguous:
+        order = np.argsort(ids, kind='stable')
+        np.save(os.path.join(version_path, INDEX_FILE), np.stack([ids[order], order]))
+
+    schema = {
+        'rows': len(df),
+        'columns': columns,
+        'scaled_features': SEGMENT_FEATURES,
+        'segment_names': {str(k): v for k, v in analytics.segment_names.items()},
+        'model_version': getattr(analytics, 'model_version', 0),
+        'first_id': int(ids[0]) if contiguous else None
+    }
+    with open(os.path.join(version_path, SCHEMA_FILE), 'w') as f:
+        json.dump(schema, f, indent=2)
+
+    _replace_file(os.path.join(path, CURRENT_FILE), lambda f: f.write(version.encode()))
+    versions = sorted(name for name in os.listdir(path) if name.startswith('v') and name[1:].isdigit())
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(path, old), ignore_errors=True)
+    return schema
+
+
+class FeatureStore:
+    """Read-only, zero-copy view over a store written by write_feature_store.
+
+    Columns are opened as read-only memory maps, so any number of worker
+    processes on the host share the same page cache instead of holding
+    their own copy of the frame. A reader stays on the version it attached
+    to; open a new FeatureStore to pick up a rewrite.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        version = _current_version(path)
+        self.version_path = path if version is None else os.path.join(path, version)
+        with open(os.path.join(self.version_path, SCHEMA_FILE)) as f:
+            self.schema = json.load(f)
+        self.columns = {
+            name: np.load(os.path.join(self.version_path, f'{name}.npy'), mmap_mode='r')
+            for name in self.schema['columns']
+        }
+        self.scaled_features = np.load(os.path.join(self.version_path, SCALED_FILE), mmap_mode='r')
+        self.segment_names = {int(k): v for k, v in self.schema['segment_names'].items()}
+        self.model_version = self.schema['model_version']
+
+        rows = self.schema['rows']
+        arrays = dict(self.columns, **{SCALED_FILE: self.scaled_features})
+        for name, values in arrays.items():
+            if len(values) != rows:
+                raise ValueError(f"Feature store column '{name}' has {len(values)} rows, schema says {rows}")
+
+        self._first_id = self.schema.get('first_id')
+        if self._first_id is None:
+            index_path = os.path.join(self.version_path, INDEX_FILE)
+            if os.path.exists(index_path):
+                self._sorted_ids, self._order = np.load(index_path, mmap_mode='r')
+            else:
+                # Stores written before the index was persisted
+                ids = self.columns['customer_id']
+                self._order = np.argsort(ids, kind='stable')
+                self._sorted_ids = np.asarray(ids)[self._order]
+        self._contiguous = self._first_id is not None
+
+    def __len__(self):
+        return self.schema['rows']
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row_of(self, customer_id):
+        """Row number of a customer, or None if unknown"""
+        if self._contiguous:
+            row = customer_id - self._first_id
+            return row if 0 <= row < len(self) else None
+        pos = np.searchsorted(self._sorted_ids, customer_id)
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == customer_id:
+            return int(self._order[pos])
+        return None
+
+    def customer(self, customer_id):
+        """All stored values for one customer as a dict, or None"""
+        row = self.row_of(customer_id)
+        if row is None:
+            return None
+        record = {name: values[row].item() for name, values in self.columns.items()}
+        record['segment_name'] = self.segment_names.get(record.get('segment'))
+        return record
+
+    def to_frame(self, columns=None):
+        """DataFrame over the requested columns (copies them into memory)"""
+        columns = columns or list(self.columns)
+        return pd.DataFrame({name: np.asarray(self.columns[name]) for name in columns})
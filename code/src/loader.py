@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from .data_generation import PRODUCT_OPTIONS
+
+# Column types of generate_synthetic_banking_data output (and the derived
+# columns saved alongside it). Columns not listed are type-inferred.
+CUSTOMER_DTYPES = {
+    'customer_id': 'int64',
+    'name': 'object',
+    'gender': 'category',
+    'age': 'int16',
+    'education': 'category',
+    'marital_status': 'category',
+    'num_children': 'int8',
+    'country': 'category',
+    'state': 'category',
+    'state_name': 'category',
+    'income': 'float64',
+    'credit_score': 'int16',
+    'checking_balance': 'float64',
+    'savings_balance': 'float64',
+    'mortgage_balance': 'float64',
+    'credit_card_balance': 'float64',
+    'investment_balance': 'float64',
+    'products_used': 'object',
+    'feedback': 'object',
+    'life_stage': 'category',
+    'groceries': 'int32', 'dining': 'int32', 'shopping': 'int32',
+    'bills': 'int32', 'investments': 'int32', 'travel': 'int32',
+    'gas': 'int32', 'luxury': 'int32', 'utilities': 'int32',
+    'app_logins': 'int32',
+    'social_posts': 'int32',
+    'rewards_claimed': 'int32',
+    'customer_service_contacts': 'int32',
+    'online_purchases': 'int32',
+    'mobile_payments': 'int32',
+    'abandoned_carts': 'int32',
+    'nps_score': 'int8',
+    'csat': 'int8',
+    'complaints': 'int8',
+    'digital_engagement_score': 'float64',
+    'ecommerce_activity_score': 'float64',
+    'debt_to_income': 'float64',
+    'net_worth': 'float64',
+    'segment_name': 'category',
+    'is_anomaly': 'bool'
+}
+
+BALANCE_COLS = ['checking_balance', 'savings_balance', 'mortgage_balance',
+                'credit_card_balance', 'investment_balance']
+
+# Every possible product combination, indexed by bitmask, shared by all rows
+_PRODUCT_TUPLES = np.empty(2 ** len(PRODUCT_OPTIONS), dtype=object)
+for _mask in range(len(_PRODUCT_TUPLES)):
+    _PRODUCT_TUPLES[_mask] = tuple(p for bit, p in enumerate(PRODUCT_OPTIONS) if _mask >> bit & 1)
+
+
+def encode_products(products):
+    """Bitmask (bit i = PRODUCT_OPTIONS[i]) of serialized product lists.
+
+    Product lists repeat heavily, so the column is factorized first and
+    only the distinct strings are tokenized, each product being matched as
+    a quoted token with numpy string ufuncs. Raises ValueError on lists that
+    name unknown products.
+    """
+    codes, uniques = pd.factorize(products.fillna('[]'), sort=False)
+    text = np.asarray(uniques, dtype=str)
+    strings = getattr(np, 'strings', np.char)
+
+    mask = np.zeros(len(text), dtype=np.uint8)
+    for bit, product in enumerate(PRODUCT_OPTIONS):
+        found = strings.find(text, f"'{product}'") >= 0
+        mask |= found.astype(np.uint8) << bit
+
+    stripped = strings.strip(text, '[]() ')
+    tokens = np.where(strings.str_len(stripped) == 0, 0, strings.count(text, ',') + 1)
+    unknown = tokens != np.unpackbits(mask[:, None], axis=1).sum(axis=1)
+    if unknown.any():
+        raise ValueError(f"{int(unknown[codes].sum())} rows list unknown products, "
+                         f"e.g. {text[unknown][0]}")
+    return mask[codes]
+
+
+def decode_products(mask):
+    """Product tuples for an array of bitmasks"""
+    return _PRODUCT_TUPLES[np.asarray(mask, dtype=np.intp)]
+
+
+def validate_customers(df):
+    """Vectorized range checks; raises ValueError listing every violation"""
+    problems = []
+    if 'credit_score' in df.columns:
+        bad = ~df['credit_score'].between(300, 850)
+        if bad.any():
+            problems.append(f"{int(bad.sum())} credit_score values outside 300-850")
+    for col in BALANCE_COLS:
+        if col in df.columns:
+            bad = df[col] < 0
+            if bad.any():
+                problems.append(f"{int(bad.sum())} negative {col} values")
+    if 'income' in df.columns:
+        bad = ~(df['income'] > 0)
+        if bad.any():
+            problems.append(f"{int(bad.sum())} non-positive income values")
+    if problems:
+        raise ValueError("Invalid customer data: " + "; ".join(problems))
+
+
+def load_customer_data(path, columns=None, chunksize=500_000, validate=True):
+    """Load a saved customer CSV with explicit types.
+
+    Reads ``columns`` (default: all) in chunks with the known dtypes,
+    encodes ``products_used`` into a ``products_mask`` bitmask plus shared
+    product tuples, and validates value ranges. The result can be passed
+    straight to BankingCustomerAnalytics.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = list(header) if columns is None else [c for c in header if c in columns]
+    dtypes = {col: CUSTOMER_DTYPES[col] for col in usecols if col in CUSTOMER_DTYPES}
+
+    chunks = []
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize):
+        if 'products_used' in chunk.columns:
+            mask = encode_products(chunk['products_used'])
+            chunk['products_mask'] = mask
+            chunk['products_used'] = decode_products(mask)
+        if validate:
+            validate_customers(chunk)
+        chunks.append(chunk)
+
+    if not chunks:
+        return pd.read_csv(path, usecols=usecols, nrows=0)
+    df = pd.concat(chunks, ignore_index=True)
+
+    # Chunks infer their own categories; merge them back into one dtype
+    for col, dtype in dtypes.items():
+        if dtype == 'category' and len(chunks) > 1:
+            df[col] = union_categoricals([chunk[col] for chunk in chunks])
+    return df
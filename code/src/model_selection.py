@@ -0,0 +1,84 @@
+import time
+from itertools import product
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+from .sampling import stratified_sample
+
+
+def _evaluate_candidate(X, k, seed, score_sample_size):
+    """Fit one (k, seed) candidate on the sample and score it"""
+    start = time.perf_counter()
+    kmeans = KMeans(n_clusters=k, random_state=seed, n_init=1)
+    labels = kmeans.fit_predict(X)
+    silhouette = silhouette_score(
+        X, labels, sample_size=min(score_sample_size, len(X)), random_state=seed
+    )
+    return {
+        'k': k,
+        'seed': seed,
+        'silhouette': silhouette,
+        'inertia_per_point': kmeans.inertia_ / len(X),
+        'fit_seconds': time.perf_counter() - start,
+        'centers': kmeans.cluster_centers_
+    }
+
+
+def select_segmentation_model(analytics, k_values=range(3, 9), seeds=range(5),
+                              sample_size=50_000, score_sample_size=10_000,
+                              strata=('state', 'life_stage'), n_jobs=-1,
+                              apply=False, random_state=42):
+    """Sweep cluster counts and initializations to pick a segmentation.
+
+    Every (k, seed) candidate is fitted on a stratified sample of the scaled
+    segmentation features, in parallel across cores, and scored by silhouette
+    (on a subsample) and inertia. The best candidate by silhouette is refitted
+    on the full data starting from its sample centers. With ``apply=True``
+    the refitted model replaces the analytics object's segmentation.
+
+    Returns a dict with the chosen ``k``, ``seed`` and ``model``, the full
+    ``labels``, a ``scores`` frame of every candidate and a ``timings``
+    breakdown in seconds.
+    """
+    timings = {}
+    X = analytics.scaled_features
+
+    start = time.perf_counter()
+    sample = X[stratified_sample(analytics.df, sample_size, strata, random_state)]
+    timings['sampling'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidates = [(k, seed) for k, seed in product(k_values, seeds) if k < len(sample)]
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_candidate)(sample, k, seed, score_sample_size)
+        for k, seed in candidates
+    )
+    timings['sweep'] = time.perf_counter() - start
+
+    scores = pd.DataFrame([
+        {key: value for key, value in result.items() if key != 'centers'}
+        for result in results
+    ])
+    best = max(results, key=lambda r: (r['silhouette'], -r['inertia_per_point']))
+
+    start = time.perf_counter()
+    model = KMeans(n_clusters=best['k'], init=best['centers'], n_init=1)
+    labels = model.fit_predict(X)
+    timings['refit'] = time.perf_counter() - start
+
+    if apply:
+        start = time.perf_counter()
+        analytics.set_segmentation(model, labels)
+        timings['apply'] = time.perf_counter() - start
+
+    timings['total'] = sum(timings.values())
+    return {
+        'k': best['k'],
+        'seed': best['seed'],
+        'model': model,
+        'labels': labels,
+        'sample_size': len(sample),
+        'scores': scores.sort_values(['silhouette'], ascending=False, ignore_index=True),
+        'timings': timings
+    }
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+# Population stability index bands: below the first is stable, above the
+# second is a significant shift that warrants a refit
+PSI_THRESHOLDS = (0.1, 0.25)
+_EPSILON = 1e-4
+# Segments with fewer new rows than this are reported but can't trigger a
+# refit on their own; their histograms are too noisy
+MIN_SEGMENT_ROWS = 100
+
+
+def population_stability_index(reference, current):
+    """PSI between two histograms along the last axis"""
+    p = _proportions(reference)
+    q = _proportions(current)
+    return ((q - p) * np.log(q / p)).sum(axis=-1)
+
+
+def ks_statistic(reference, current):
+    """Largest gap between two binned CDFs along the last axis"""
+    p = np.cumsum(_proportions(reference), axis=-1)
+    q = np.cumsum(_proportions(current), axis=-1)
+    return np.abs(q - p).max(axis=-1)
+
+
+def _proportions(counts):
+    """Bin shares, floored so empty bins don't make PSI infinite"""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum(axis=-1, keepdims=True)
+    return np.maximum(counts / np.maximum(total, 1), _EPSILON)
+
+
+def _psi_status(psi):
+    return np.where(psi < PSI_THRESHOLDS[0], 'stable',
+                    np.where(psi < PSI_THRESHOLDS[1], 'moderate', 'significant'))
+
+
+class DriftMonitor:
+    """Detects drift of new customer batches away from the training data.
+
+    At fit time every segmentation feature (in scaled space) is cut into
+    equal-frequency bins and the reference counts are kept per segment, a
+    few hundred numbers in total. New batches are scaled, assigned to a
+    segment and binned in one pass, chunk by chunk, accumulating into the
+    same fixed-size count arrays, so memory does not grow with the data.
+    ``report`` compares the two with PSI and binned KS per feature and per
+    segment, plus PSI of the segment mix.
+    """
+
+    def __init__(self, scaler, kmeans, scaled_features, segments, features,
+                 segment_names=None, bins=10, reference_sample=200_000,
+                 chunk_size=1_000_000, min_segment_rows=MIN_SEGMENT_ROWS, random_state=42):
+        self._mean = scaler.mean_
+        self._scale = scaler.scale_
+        self.kmeans = kmeans
+        self.features = list(features)
+        self.segment_names = dict(segment_names or {})
+        self.bins = bins
+        self.chunk_size = chunk_size
+        self.min_segment_rows = min_segment_rows
+        self.n_segments = kmeans.n_clusters
+
+        segments = np.asarray(segments, dtype=np.intp)
+        rows = np.arange(len(segments))
+        if reference_sample is not None and reference_sample < len(rows):
+            rng = np.random.default_rng(random_state)
+            rows = np.sort(rng.choice(len(rows), reference_sample, replace=False))
+        X = np.asarray(scaled_features)[rows]
+
+        # Interior quantile cut points; repeated values collapse to fewer bins
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        self.edges = [np.unique(np.quantile(X[:, j], quantiles)) for j in range(X.shape[1])]
+        self.reference = self._histogram(X, segments[rows])
+        self.reference_segments = np.bincount(segments, minlength=self.n_segments)
+        self.reset()
+
+    def _histogram(self, X, segments):
+        """Counts of shape (segments, features, bins)"""
+        counts = np.zeros((self.n_segments, len(self.features), self.bins), dtype=np.int64)
+        for j, edges in enumerate(self.edges):
+            cells = segments * self.bins + np.searchsorted(edges, X[:, j], side='right')
+            counts[:, j, :] += np.bincount(cells, minlength=self.n_segments * self.bins).reshape(
+                self.n_segments, self.bins)
+        return counts
+
+    def reset(self):
+        """Forget all batches seen since the last reset"""
+        self.current = np.zeros_like(self.reference)
+        self.current_segments = np.zeros(self.n_segments, dtype=np.int64)
+        self.rows = 0
+
+    def update(self, df):
+        """Fold a batch of customers (with engineered features) into the counts"""
+        values = df[self.features].fillna(0).to_numpy(dtype=np.float64)
+        for start in range(0, len(values), self.chunk_size):
+            X = (values[start:start + self.chunk_size] - self._mean) / self._scale
+            segments = self.kmeans.predict(X)
+            self.current += self._histogram(X, segments)
+            self.current_segments += np.bincount(segments, minlength=self.n_segments)
+        self.rows += len(values)
+        return self
+
+    def report(self):
+        """Drift of everything seen since the last reset.
+
+        Returns a dict with the row count, a ``features`` frame (PSI, KS and
+        status per feature), a ``segments`` frame (reference and current
+        share, new rows, worst feature PSI within the segment), the
+        ``segment_mix_psi`` and ``needs_refit``. The latter is set once any
+        feature, the segment mix, or any feature within a segment holding at
+        least ``min_segment_rows`` new rows crosses the significant PSI
+        threshold.
+        """
+        reference = self.reference.sum(axis=0)
+        current = self.current.sum(axis=0)
+        psi = population_stability_index(reference, current)
+        features = pd.DataFrame({
+            'psi': psi,
+            'ks': ks_statistic(reference, current),
+            'status': _psi_status(psi)
+        }, index=pd.Index(self.features, name='feature'))
+
+        segment_psi = population_stability_index(self.reference, self.current)
+        seen = self.current_segments > 0
+        names = [self.segment_names.get(i, f'Segment {i}') for i in range(self.n_segments)]
+        segments = pd.DataFrame({
+            'reference_share': self.reference_segments / max(self.reference_segments.sum(), 1),
+            'current_share': self.current_segments / max(self.rows, 1),
+            'rows': self.current_segments,
+            'max_psi': np.where(seen, segment_psi.max(axis=1), np.nan),
+            'most_drifted': np.where(seen, np.array(self.features)[segment_psi.argmax(axis=1)], None)
+        }, index=pd.Index(names, name='segment_name'))
+
+        mix_psi = float(population_stability_index(self.reference_segments, self.current_segments))
+        trusted = self.current_segments >= max(self.min_segment_rows, 1)
+        segment_drift = trusted.any() and segment_psi.max(axis=1)[trusted].max() >= PSI_THRESHOLDS[1]
+        needs_refit = self.rows > 0 and (
+            psi.max() >= PSI_THRESHOLDS[1] or mix_psi >= PSI_THRESHOLDS[1] or segment_drift
+        )
+        return {
+            'rows': self.rows,
+            'features': features,
+            'segments': segments,
+            'segment_mix_psi': mix_psi,
+            'needs_refit': bool(needs_refit)
+        }
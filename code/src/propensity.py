@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from .data_generation import PRODUCT_OPTIONS
+
+# Engineered features the propensity models use as inputs
+PROPENSITY_FEATURES = [
+    'age', 'num_children', 'income', 'credit_score',
+    'debt_to_income', 'savings_ratio', 'investment_ratio',
+    'digital_engagement_score', 'ecommerce_activity_score', 'clv'
+]
+
+
+class ProductPropensityModel:
+    """One logistic regression per product, scored for every customer at once.
+
+    Models are trained on the ``has_<product>`` columns as labels (on a
+    random sample when the base is large). Because all models share the
+    same scaled inputs, batch scoring is a single matrix product over the
+    whole population; top-K selection uses partial sorting.
+    """
+
+    def __init__(self, analytics, products=None, features=None,
+                 training_sample=200_000, random_state=42):
+        self.analytics = analytics
+        df = analytics.df
+        self.features = list(features or PROPENSITY_FEATURES)
+        self.products = [p for p in (products or PRODUCT_OPTIONS) if f'has_{p}' in df.columns]
+        self.scores = None
+
+        rng = np.random.default_rng(random_state)
+        rows = np.arange(len(df))
+        if training_sample is not None and training_sample < len(df):
+            rows = np.sort(rng.choice(len(df), training_sample, replace=False))
+        X = df[self.features].iloc[rows].fillna(0).to_numpy(dtype=np.float64)
+        self.scaler = StandardScaler().fit(X)
+        X = self.scaler.transform(X)
+
+        # Stack every product's coefficients so scoring is one matmul
+        self.coef = np.zeros((len(self.features), len(self.products)))
+        self.intercept = np.zeros(len(self.products))
+        for j, product in enumerate(self.products):
+            labels = df[f'has_{product}'].iloc[rows].to_numpy(dtype=bool)
+            if labels.all() or not labels.any():
+                # Nothing to learn; fall back to the (clipped) base rate
+                rate = np.clip(labels.mean(), 1e-6, 1 - 1e-6)
+                self.intercept[j] = np.log(rate / (1 - rate))
+                continue
+            model = LogisticRegression(max_iter=500).fit(X, labels)
+            self.coef[:, j] = model.coef_[0]
+            self.intercept[j] = model.intercept_[0]
+
+    def _predict(self, X):
+        """Probabilities for raw feature rows, one column per product"""
+        logits = self.scaler.transform(X) @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def score_all(self, chunk_size=1_000_000):
+        """Score every customer for every product, in chunks"""
+        df = self.analytics.df
+        self.scores = np.empty((len(df), len(self.products)), dtype=np.float32)
+        for start in range(0, len(df), chunk_size):
+            # Only one chunk is ever held as a float matrix
+            X = df.iloc[start:start + chunk_size][self.features].fillna(0).to_numpy(dtype=np.float64)
+            self.scores[start:start + chunk_size] = self._predict(X)
+        return self.scores
+
+    def score_customer(self, customer):
+        """Propensity of one customer row for every product"""
+        X = np.array([[customer[f] for f in self.features]], dtype=np.float64)
+        return dict(zip(self.products, self._predict(np.nan_to_num(X))[0]))
+
+    def top_k(self, product, k, exclude_owners=True, segment_quotas=None):
+        """The ``k`` most likely buyers of ``product``.
+
+        ``segment_quotas`` caps how many candidates each named segment may
+        contribute. Selection uses argpartition, so only the winners are
+        sorted. Returns customer_id, segment_name and score, best first.
+        """
+        if self.scores is None:
+            self.score_all()
+        df = self.analytics.df
+        scores = self.scores[:, self.products.index(product)].astype(np.float64)
+        if exclude_owners:
+            scores[df[f'has_{product}'].to_numpy(dtype=bool)] = -np.inf
+
+        if segment_quotas:
+            segments = df['segment_name'].to_numpy()
+            candidates = [np.flatnonzero(~np.isin(segments, list(segment_quotas)))]
+            for segment, quota in segment_quotas.items():
+                members = np.flatnonzero(segments == segment)
+                candidates.append(members[_top_indices(scores[members], min(quota, k))])
+            candidates = np.concatenate(candidates)
+        else:
+            candidates = np.arange(len(scores))
+
+        chosen = candidates[_top_indices(scores[candidates], k)]
+        chosen = chosen[np.isfinite(scores[chosen])]
+        return pd.DataFrame({
+            'customer_id': df['customer_id'].to_numpy()[chosen],
+            'segment_name': df['segment_name'].to_numpy()[chosen],
+            'score': scores[chosen]
+        })
+
+
+def _top_indices(values, k):
+    """Indices of the k largest values, largest first"""
+    k = min(k, len(values))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-values, k - 1)[:k]
+    return top[np.argsort(-values[top], kind='stable')]
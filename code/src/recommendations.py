@@ -1,6 +1,27 @@
+import numpy as np
+import pandas as pd
+from .cache import customer_version
+
+
 class BankingRecommendationEngine:
-    def __init__(self, analytics):
+    """Rule-based recommendations for one customer at a time.
+
+    Build one engine and reuse it across requests: the customer id index and
+    per-segment medians are computed once and only rebuilt when the data
+    or the models change. With a StreamingAnomalyScorer attached, the
+    unusual-activity alert follows the scorer's live flag, and customers it
+    raises an alert for are evicted from the cache.
+    """
+
+    def __init__(self, analytics, cache=None, propensity=None, scorer=None):
         self.analytics = analytics
+        self.cache = cache
+        self.propensity = propensity
+        self.scorer = scorer
+        if scorer is not None:
+            self._forward_alerts = scorer.on_alert
+            scorer.on_alert = self._on_alert
+        self._lookup_key = None
         self.product_info = {
             'checking': {'desc': "Basic checking account", 'benefit': "No fees"},
             'savings': {'desc': "High-yield savings", 'benefit': "2.5% APY"},
@@ -12,40 +33,97 @@ class BankingRecommendationEngine:
             'debit_card': {'desc': "Debit card", 'benefit': "Easy access"}
         }
     
+    def _refresh_lookups(self):
+        """Rebuild the id index and segment medians if the data, models or
+        segment statistics changed"""
+        df = self.analytics.df
+        key = (id(df), len(df), getattr(self.analytics, 'model_version', 0),
+               getattr(self.analytics, 'stats_version', 0))
+        if key == self._lookup_key:
+            return
+        ids = df['customer_id']
+        first = ~ids.duplicated().to_numpy()
+        self._positions = pd.Series(np.flatnonzero(first), index=ids[first].to_numpy())
+        self._segment_logins = df.groupby('segment')['app_logins'].median().to_dict()
+        self._lookup_key = key
+    
+    def _on_alert(self, alerts):
+        """Drop cached results of newly flagged customers, then pass the alerts on"""
+        if self.cache is not None:
+            for customer_id in alerts['customer_id']:
+                self.cache.invalidate(customer_id)
+        if self._forward_alerts is not None:
+            self._forward_alerts(alerts)
+
+    def is_anomalous(self, customer):
+        """Live anomaly flag from the scorer, else the batch flag"""
+        if self.scorer is not None:
+            return bool(self.scorer.customer_alerts(customer['customer_id']))
+        return bool(customer['is_anomaly'])
+
+    def find_customer(self, customer_id):
+        """Customer row by id in O(1), or None"""
+        self._refresh_lookups()
+        position = self._positions.get(customer_id)
+        return None if position is None else self.analytics.df.iloc[position]
+    
     def generate_recommendations(self, customer_id):
         """Generate personalized recommendations"""
-        try:
-            customer = self.analytics.df[self.analytics.df['customer_id'] == customer_id].iloc[0]
-            segment_data = self.analytics.df[self.analytics.df['segment'] == customer['segment']]
-            
-            recommendations = {
-                'financial_products': self._get_product_recs(customer),
-                'digital_services': self._get_digital_recs(customer, segment_data),
-                'wealth_management': self._get_wealth_recs(customer),
-                'credit_optimization': self._get_credit_recs(customer),
-                'financial_education': self._get_life_stage_recs(customer),
-                'banking_habits': self._get_habit_recs(customer),
-                'alerts': self._get_alerts(customer, segment_data)
-            }
-            
-            return recommendations
-        except IndexError:
+        customer = self.find_customer(customer_id)
+        if customer is None:
             print(f"Customer {customer_id} not found")
             return None
+        return self.recommend(customer)
+    
+    def recommend(self, customer):
+        """Recommendations for a customer row, through the cache if any"""
+        customer_id = customer['customer_id']
+        if self.cache is None:
+            return self._build_recommendations(customer)
+        
+        self._refresh_lookups()
+        segment_stats = {'app_logins': self._segment_logins.get(customer['segment'], 0)}
+        version = customer_version(customer, getattr(self.analytics, 'model_version', 0), segment_stats)
+        if self.scorer is not None:
+            # A flag raised or cleared by the stream changes the alerts
+            version = customer_version({'version': version, 'flagged': self.is_anomalous(customer)})
+        return self.cache.get_or_compute(
+            'recommendations', customer_id, version,
+            lambda: self._build_recommendations(customer)
+        )
+    
+    def _build_recommendations(self, customer):
+        """Run every recommendation rule for one customer"""
+        self._refresh_lookups()
+        segment_logins = self._segment_logins.get(customer['segment'], 0)
+        
+        return {
+            'financial_products': self._get_product_recs(customer),
+            'digital_services': self._get_digital_recs(customer, segment_logins),
+            'wealth_management': self._get_wealth_recs(customer),
+            'credit_optimization': self._get_credit_recs(customer),
+            'financial_education': self._get_life_stage_recs(customer),
+            'banking_habits': self._get_habit_recs(customer),
+            'alerts': self._get_alerts(customer)
+        }
     
     def _get_product_recs(self, customer):
         """Recommend products customer doesn't have"""
         current_products = customer['products_used']
+        candidates = [p for p in self.product_info if p not in current_products]
+        if self.propensity is not None:
+            # Most likely products first
+            scores = self.propensity.score_customer(customer)
+            candidates.sort(key=lambda p: -scores.get(p, 0))
         return [
             f"{self.product_info[p]['desc']}: {self.product_info[p]['benefit']}"
-            for p in self.product_info
-            if p not in current_products
+            for p in candidates
         ][:3]  # Limit to top 3
     
-    def _get_digital_recs(self, customer, segment_data):
+    def _get_digital_recs(self, customer, segment_logins):
         """Digital service recommendations"""
         recs = []
-        if customer['app_logins'] < segment_data['app_logins'].median():
+        if customer['app_logins'] < segment_logins:
             recs.append("Enable push notifications to increase app engagement")
         if customer['mobile_payments'] < 5:
             recs.append("Try our mobile payment feature for faster checkouts")
@@ -90,11 +168,13 @@ class BankingRecommendationEngine:
             recs.append("Debt consolidation options available")
         return recs
     
-    def _get_alerts(self, customer, segment_data):
+    def _get_alerts(self, customer):
         """Financial alerts"""
         alerts = []
-        if customer['is_anomaly']:
+        if self.is_anomalous(customer):
             alerts.append("Unusual activity detected - please verify your transactions")
         if customer['debt_to_income'] > 0.5:
             alerts.append("High debt-to-income ratio - consider debt counseling")
+        if customer.get('churn_risk_category') == 'High':
+            alerts.append("High churn risk - reach out with a retention offer")
         return alerts
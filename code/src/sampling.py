@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+
+def income_band(income, n_bands=5):
+    """Quantile band (0..n_bands-1) of each income"""
+    return pd.qcut(income.rank(method='first'), n_bands, labels=False).astype(np.int8)
+
+
+def stratified_sample(df, size, strata, random_state=42):
+    """Positional indices of a proportional stratified sample of ``df``.
+
+    Each stratum keeps at least one row, so small groups are not lost; the
+    sample can therefore be slightly larger than ``size``. Returns every row
+    if ``size`` covers the frame.
+    """
+    n_rows = len(df)
+    if size >= n_rows:
+        return np.arange(n_rows)
+
+    groups = df.groupby(list(strata), sort=False, observed=True).ngroup().to_numpy()
+    counts = np.bincount(groups)
+    quotas = np.maximum(1, np.round(counts * size / n_rows)).astype(np.int64)
+
+    # Random order within each stratum, then keep the first quota rows
+    rng = np.random.default_rng(random_state)
+    order = np.lexsort((rng.random(n_rows), groups))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(n_rows) - starts[groups[order]]
+    return np.sort(order[rank < quotas[groups[order]]])
@@ -0,0 +1,233 @@
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+import numpy as np
+import pandas as pd
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
+from nltk.sentiment.vader import VaderConstants
+
+# Initialize NLTK
+nltk.download('vader_lexicon', quiet=True)
+
+# Banking-specific additions to the VADER lexicon
+BANKING_LEXICON = {
+    'improvement': -0.5, 'excellent': 2.0, 'confusing': -1.5,
+    'best': 1.8, 'better': 0.5, 'needs': -0.7, 'love': 1.5,
+    'slow': -1.0, 'intuitive': 1.2, 'low': -0.8, 'great': 1.3
+}
+
+_C = VaderConstants
+_PUNCTUATION = set(string.punctuation)
+# Per-vocabulary flags, as bit positions; the first set matches lowercased
+# words, the second the word as written (as VADER compares them)
+_FLAG_WORDS = ['but', 'least', 'kind', 'of', 'at', 'very', 'sort', 'just', 'enough']
+_EXACT_WORDS = ['never', 'so', 'this']
+_FLAG_BITS = {word: 1 << bit for bit, word in enumerate(_FLAG_WORDS)}
+_EXACT_BITS = {word: 1 << bit for bit, word in enumerate(_EXACT_WORDS, start=len(_FLAG_WORDS))}
+
+
+def banking_sentiment_analyzer():
+    """VADER analyzer extended with the banking lexicon"""
+    sia = SentimentIntensityAnalyzer()
+    sia.lexicon.update(BANKING_LEXICON)
+    return sia
+
+
+def _strip_punctuation(token):
+    """VADER's rule: drop one leading or trailing PUNC_LIST unit from a word"""
+    if token[0] not in _PUNCTUATION and token[-1] not in _PUNCTUATION:
+        return token
+    for punc in _C.PUNC_LIST:
+        for word in (token[len(punc):] if token.startswith(punc) else None,
+                     token[:-len(punc)] if token.endswith(punc) else None):
+            if word and len(word) > 1 and not _PUNCTUATION.intersection(word):
+                return word
+    return token
+
+
+class BatchSentimentAnalyzer:
+    """VADER compound scores for a whole column of text at once.
+
+    The lexicon and VADER's word lists are compiled against the vocabulary
+    of each batch: every distinct token is looked up once, and the per-token
+    valence, booster, negation and capitalization attributes are gathered
+    into flat arrays. The VADER rules (caps emphasis, boosters, negation
+    within three words, "least", "but" and punctuation emphasis) are then
+    applied with shifted-array arithmetic across all documents together.
+    Idioms are not applied; scores otherwise match
+    ``SentimentIntensityAnalyzer.polarity_scores(text)['compound']``.
+    """
+
+    def __init__(self, lexicon_updates=None):
+        self.lexicon = dict(SentimentIntensityAnalyzer().lexicon)
+        self.lexicon.update(BANKING_LEXICON)
+        self.lexicon.update(lexicon_updates or {})
+
+    def _compile_vocabulary(self, vocabulary):
+        """Attribute arrays for each distinct raw token"""
+        n = len(vocabulary)
+        keep = np.zeros(n, dtype=bool)
+        valence = np.zeros(n)
+        in_lexicon = np.zeros(n, dtype=bool)
+        booster = np.zeros(n)
+        negated = np.zeros(n, dtype=bool)
+        upper = np.zeros(n, dtype=bool)
+        flags = np.zeros(n, dtype=np.int32)
+        exclamations = np.zeros(n, dtype=np.int64)
+        questions = np.zeros(n, dtype=np.int64)
+        words = np.empty(n, dtype=object)
+        lexicon, boosters, negate = self.lexicon, _C.BOOSTER_DICT, _C.NEGATE
+        for v, token in enumerate(vocabulary):
+            exclamations[v] = token.count('!')
+            questions[v] = token.count('?')
+            if len(token) <= 1:
+                continue
+            keep[v] = True
+            word = words[v] = _strip_punctuation(token)
+            lower = word.lower()
+            if lower in lexicon:
+                in_lexicon[v] = True
+                valence[v] = lexicon[lower]
+            if lower in boosters:
+                booster[v] = boosters[lower]
+            negated[v] = lower in negate or "n't" in lower
+            upper[v] = word.isupper()
+            flags[v] = _FLAG_BITS.get(lower, 0) | _EXACT_BITS.get(word, 0)
+        # Raw tokens that strip to the same word share one word id
+        word_ids, _ = pd.factorize(words)
+        return {
+            'keep': keep, 'valence': valence, 'in_lexicon': in_lexicon,
+            'booster': booster, 'negated': negated, 'upper': upper, 'flags': flags,
+            'exclamations': exclamations, 'questions': questions,
+            'word_ids': word_ids
+        }
+
+    def _score(self, texts):
+        """Compound scores for one batch of texts"""
+        split = [str(text).split() for text in texts]
+        n_docs = len(split)
+        counts = np.fromiter(map(len, split), dtype=np.int64, count=n_docs)
+        raw = np.fromiter(chain.from_iterable(split), dtype=object, count=int(counts.sum()))
+        raw_doc = np.repeat(np.arange(n_docs), counts)
+        if len(raw) == 0:
+            return np.zeros(n_docs)
+
+        codes, vocabulary = pd.factorize(raw)
+        vocab = self._compile_vocabulary(vocabulary)
+
+        # Punctuation emphasis counts every '!' and '?' in the raw text
+        bangs = np.minimum(np.bincount(raw_doc, weights=vocab['exclamations'][codes], minlength=n_docs), 4)
+        marks = np.bincount(raw_doc, weights=vocab['questions'][codes], minlength=n_docs)
+        amplifier = bangs * 0.292 + np.where(marks > 1, np.where(marks <= 3, marks * 0.18, 0.96), 0)
+
+        # Single-character tokens are dropped before scoring
+        kept = vocab['keep'][codes]
+        codes, doc = codes[kept], raw_doc[kept]
+        n_tokens = len(codes)
+        if n_tokens == 0:
+            return np.zeros(n_docs)
+        doc_counts = np.bincount(doc, minlength=n_docs)
+        doc_start = np.concatenate([[0], np.cumsum(doc_counts)[:-1]])
+        position = np.arange(n_tokens) - doc_start[doc]
+
+        in_lexicon = vocab['in_lexicon'][codes]
+        booster = vocab['booster'][codes]
+        negated = vocab['negated'][codes]
+        upper = vocab['upper'][codes]
+        flags = vocab['flags'][codes]
+        word_ids = vocab['word_ids'][codes]
+
+        def flag(name):
+            bit = (_FLAG_WORDS + _EXACT_WORDS).index(name)
+            return (flags >> bit & 1).astype(bool)
+
+        def back(values, k, fill):
+            """values[i - k] within the same document, else ``fill``"""
+            shifted = np.full(n_tokens, fill, dtype=values.dtype)
+            shifted[k:] = values[:-k]
+            shifted[position < k] = fill
+            return shifted
+
+        def forward(values, fill):
+            shifted = np.full(n_tokens, fill, dtype=values.dtype)
+            shifted[:-1] = values[1:]
+            shifted[position == doc_counts[doc] - 1] = fill
+            return shifted
+
+        upper_count = np.bincount(doc, weights=upper, minlength=n_docs)
+        cap_diff = ((doc_counts - upper_count > 0) & (upper_count > 0))[doc]
+        cap_boost = upper & cap_diff
+
+        valence = vocab['valence'][codes].copy()
+        valence = np.where(cap_boost, valence + np.where(valence > 0, _C.C_INCR, -_C.C_INCR), valence)
+        is_so_this = flag('so') | flag('this')
+
+        for k, damping in ((0, 1.0), (1, 0.95), (2, 0.9)):
+            active = (position > k) & ~back(in_lexicon, k + 1, True)
+            scalar = back(booster, k + 1, 0.0)
+            scalar = np.where(valence < 0, -scalar, scalar)
+            scalar = np.where(
+                back(cap_boost, k + 1, False) & (scalar != 0),
+                scalar + np.where(valence > 0, _C.C_INCR, -_C.C_INCR), scalar
+            )
+            valence = np.where(active, valence + scalar * damping, valence)
+
+            prior_negated = back(negated, k + 1, False)
+            if k == 0:
+                factor = np.where(prior_negated, _C.N_SCALAR, 1.0)
+            elif k == 1:
+                never_so = back(flag('never'), 2, False) & back(is_so_this, 1, False)
+                factor = np.where(never_so, 1.5, np.where(prior_negated, _C.N_SCALAR, 1.0))
+            else:
+                never_so = (back(flag('never'), 3, False) & back(is_so_this, 2, False)) | back(is_so_this, 1, False)
+                factor = np.where(never_so, 1.25, np.where(prior_negated, _C.N_SCALAR, 1.0))
+                # Booster bi-grams such as "kind of" two or three words back
+                bigram = (
+                    (back(flag('kind') | flag('sort'), 2, False) & back(flag('of'), 1, False))
+                    | (back(flag('kind') | flag('sort'), 3, False) & back(flag('of'), 2, False))
+                    | (back(flag('just'), 2, False) & back(flag('enough'), 1, False))
+                    | (back(flag('just'), 3, False) & back(flag('enough'), 2, False))
+                )
+            valence = np.where(active, valence * factor, valence)
+            if k == 2:
+                valence = np.where(active & bigram, valence + _C.B_DECR, valence)
+
+        # "least" negates unless preceded by "at least" / "very least"
+        after_least = back(flag('least'), 1, False) & ~back(in_lexicon, 1, True)
+        excused = back(flag('at') | flag('very'), 2, False)
+        valence = np.where(after_least & ~excused, valence * _C.N_SCALAR, valence)
+
+        # Boosters and "kind of" carry no valence of their own
+        skip = (booster != 0) | (flag('kind') & forward(flag('of'), False))
+        sentiment = np.where(in_lexicon & ~skip, valence, 0.0)
+
+        # VADER scores repeated words in the context of their first occurrence
+        key = doc.astype(np.int64) * (len(vocabulary) + 1) + word_ids
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+        sentiment = sentiment[first[inverse]]
+
+        # Words before the first "but" count half, words after it 1.5x
+        is_but = flag('but')
+        first_but = np.full(n_docs, np.iinfo(np.int64).max)
+        np.minimum.at(first_but, doc[is_but], position[is_but])
+        but_at = first_but[doc]
+        sentiment = np.where(position < but_at, np.where(but_at < np.iinfo(np.int64).max, 0.5, 1.0),
+                             np.where(position > but_at, 1.5, 1.0)) * sentiment
+
+        total = np.bincount(doc, weights=sentiment, minlength=n_docs)
+        total = np.where(total > 0, total + amplifier, np.where(total < 0, total - amplifier, total))
+        return np.round(total / np.sqrt(total * total + 15), 4)
+
+    def compound(self, texts, n_jobs=1, chunk_size=200_000):
+        """Compound score of every text, optionally across processes"""
+        texts = list(texts)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        if not chunks:
+            return np.zeros(0)
+        if n_jobs == 1 or len(chunks) == 1:
+            return np.concatenate([self._score(chunk) for chunk in chunks])
+        max_workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return np.concatenate(list(pool.map(self._score, chunks)))
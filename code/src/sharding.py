@@ -0,0 +1,135 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+import pandas as pd
+from .analytics import BankingCustomerAnalytics, SEGMENT_FEATURES, assign_models
+
+# Columns summarised per segment in the merged global view
+SEGMENT_STAT_COLS = SEGMENT_FEATURES + ['debt_to_income', 'net_worth', 'sentiment']
+SENTIMENT_CATEGORIES = ['Negative', 'Neutral', 'Positive']
+
+
+def shard_ids(df, n_shards, partition='customer_id'):
+    """Shard number of every row, from a stable hash of the partition column"""
+    hashes = pd.util.hash_array(df[partition].to_numpy())
+    return (hashes % np.uint64(n_shards)).astype(np.int64)
+
+
+def _prepare_shard(shard):
+    """Preprocessing and feature creation for one shard"""
+    return BankingCustomerAnalytics(shard, fit=False).df
+
+
+def _score_shard(shard, scaler, kmeans, anomaly_detector, chunk_size):
+    """Assign segments and anomaly flags for one shard, plus partial aggregates"""
+    scaled, segments, anomaly_scores = assign_models(
+        shard[SEGMENT_FEATURES], scaler, kmeans, anomaly_detector, chunk_size
+    )
+    n_segments = kmeans.n_clusters
+    stats = shard[SEGMENT_STAT_COLS].fillna(0).to_numpy(dtype=np.float64)
+    sums = np.zeros((n_segments, stats.shape[1]))
+    np.add.at(sums, segments, stats)
+    anomalies = np.bincount(segments, weights=anomaly_scores == -1, minlength=n_segments)
+    sentiment = shard['sentiment_category'].value_counts().reindex(SENTIMENT_CATEGORIES, fill_value=0)
+    return {
+        'scaled': scaled,
+        'segments': segments,
+        'anomaly_scores': anomaly_scores,
+        'counts': np.bincount(segments, minlength=n_segments),
+        'sums': sums,
+        'anomalies': anomalies,
+        'sentiment': sentiment.to_numpy()
+    }
+
+
+class ShardedAnalytics(BankingCustomerAnalytics):
+    """BankingCustomerAnalytics run across a process pool.
+
+    Customers are partitioned into shards by a hash of ``partition`` (for
+    example ``customer_id`` or ``state``). Preprocessing, features and scoring
+    run per shard in worker processes; the scaler and models are fitted once
+    on a stratified sample of the merged features and shipped to every
+    worker. Per-shard results and partial aggregates are merged back, so the
+    instance exposes the same ``df`` and models as the single-process class,
+    plus ``segment_stats`` and ``sentiment_distribution``.
+    """
+
+    def __init__(self, df, n_shards=None, partition='customer_id', max_workers=None,
+                 training_sample=100_000, chunk_size=1_000_000):
+        self.n_shards = n_shards or os.cpu_count() or 1
+        self.partition = partition
+        self.max_workers = max_workers
+        self.model_version = 0
+        self.stats_version = 0
+        self.training_sample = training_sample or len(df)
+        self.chunk_size = chunk_size
+        self.timings = {}
+
+        df = df.reset_index(drop=True)
+        assignment = shard_ids(df, self.n_shards, partition)
+        shards = [df[assignment == i] for i in range(self.n_shards)]
+        shards = [shard for shard in shards if len(shard)]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            start = time.perf_counter()
+            prepared = list(pool.map(_prepare_shard, shards))
+            self.df = pd.concat(prepared).sort_index()
+            # Product indicators only exist for products seen in each shard
+            has_cols = [col for col in self.df.columns if col.startswith('has_')]
+            self.df[has_cols] = self.df[has_cols].fillna(False).astype(bool)
+            self.timings['prepare'] = time.perf_counter() - start
+
+            kmeans, sample_size = self._fit_models_on_sample(self.timings)
+
+            start = time.perf_counter()
+            scored = list(pool.map(
+                _score_shard,
+                [shard[SEGMENT_STAT_COLS + ['sentiment_category']] for shard in prepared],
+                repeat(self.scaler), repeat(kmeans), repeat(self.anomaly_detector),
+                repeat(chunk_size)
+            ))
+            self.timings['score'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._merge(prepared, scored, kmeans)
+        self.timings['merge'] = time.perf_counter() - start
+        self.training_report = {
+            'mode': 'sharded',
+            'shards': len(shards),
+            'sample_size': sample_size,
+            'population': len(self.df),
+            'timings': self.timings
+        }
+
+    def _merge(self, prepared, scored, kmeans):
+        """Scatter per-shard results back into the global frame and aggregates"""
+        positions = np.concatenate([shard.index.to_numpy() for shard in prepared])
+        n_features = len(SEGMENT_FEATURES)
+
+        self.scaled_features = np.empty((len(self.df), n_features))
+        self.scaled_features[positions] = np.concatenate([part['scaled'] for part in scored])
+        segments = np.empty(len(self.df), dtype=np.int32)
+        segments[positions] = np.concatenate([part['segments'] for part in scored])
+        anomaly_scores = np.empty(len(self.df), dtype=np.int64)
+        anomaly_scores[positions] = np.concatenate([part['anomaly_scores'] for part in scored])
+
+        self.set_segmentation(kmeans, segments)
+        self.df['anomaly_score'] = anomaly_scores
+        self.df['is_anomaly'] = self.df['anomaly_score'] == -1
+
+        counts = sum(part['counts'] for part in scored)
+        sums = sum(part['sums'] for part in scored)
+        anomalies = sum(part['anomalies'] for part in scored)
+        stats = pd.DataFrame(
+            sums / np.maximum(counts, 1)[:, None],
+            columns=[f'avg_{col}' for col in SEGMENT_STAT_COLS]
+        )
+        stats.insert(0, 'customers', counts)
+        stats.insert(1, 'anomaly_rate', anomalies / np.maximum(counts, 1))
+        stats.index = pd.Index([self.segment_names[i] for i in range(len(counts))], name='segment_name')
+        self.segment_stats = stats
+
+        sentiment = sum(part['sentiment'] for part in scored)
+        self.sentiment_distribution = pd.Series(sentiment, index=SENTIMENT_CATEGORIES, name='customers')
@@ -0,0 +1,249 @@
+import numpy as np
+from .analytics import SEGMENT_FEATURES
+
+# Counters that decay over the window and grow with each activity update
+ACTIVITY_FIELDS = [
+    'app_logins', 'social_posts', 'rewards_claimed',
+    'online_purchases', 'mobile_payments', 'abandoned_carts'
+]
+# Balances that are overwritten by the latest update
+BALANCE_FIELDS = ['checking_balance', 'savings_balance', 'investment_balance']
+# Field codes of activity updates index into this list
+UPDATE_FIELDS = ACTIVITY_FIELDS + BALANCE_FIELDS
+
+UPDATE_DTYPE = np.dtype([
+    ('customer_id', '<i8'),
+    ('timestamp', '<i8'),     # seconds since the epoch
+    ('field', 'u1'),          # index into UPDATE_FIELDS
+    ('value', '<f8')          # increment for activity fields, new value for balances
+])
+
+ALERT_DTYPE = np.dtype([
+    ('customer_id', '<i8'),
+    ('timestamp', '<i8'),
+    ('score', '<f8')
+])
+
+ALERT_MESSAGE = "Unusual activity detected - please verify your transactions"
+
+_STATE_COLS = ['income', 'credit_score'] + UPDATE_FIELDS
+_COL = {name: i for i, name in enumerate(_STATE_COLS)}
+
+
+def _average_path_length(n_samples):
+    """Expected isolation path length for a node holding n_samples points"""
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    lengths = np.zeros_like(n_samples)
+    lengths[n_samples == 2] = 1.0
+    many = n_samples > 2
+    lengths[many] = (
+        2.0 * (np.log(n_samples[many] - 1.0) + np.euler_gamma)
+        - 2.0 * (n_samples[many] - 1.0) / n_samples[many]
+    )
+    return lengths
+
+
+class CompiledIsolationForest:
+    """Flat-array copy of a fitted IsolationForest for batch scoring.
+
+    Every tree is laid out as a complete binary tree of the forest's maximum
+    depth (children of slot ``i`` at ``2i+1`` and ``2i+2``). Leaves above the
+    bottom level always branch left down to a bottom slot holding their path
+    length, so a batch is scored with ``max_depth`` rounds of plain numpy
+    indexing over all (row, tree) pairs. Scores match
+    ``IsolationForest.score_samples``.
+    """
+
+    def __init__(self, detector):
+        trees = [(tree.tree_, np.asarray(features))
+                 for tree, features in zip(detector.estimators_, detector.estimators_features_)]
+        self.max_depth = max(t.max_depth for t, _ in trees)
+        n_slots = 2 ** (self.max_depth + 1) - 1
+        n_internal = 2 ** self.max_depth - 1
+
+        self.feature = np.zeros((len(trees), n_internal), dtype=np.int32)
+        self.threshold = np.full((len(trees), n_internal), np.inf)
+        self.leaf_value = np.zeros((len(trees), n_slots))
+        for i, (t, features) in enumerate(trees):
+            stack = [(0, 0, 0)]  # (node, slot, depth)
+            while stack:
+                node, slot, depth = stack.pop()
+                if t.children_left[node] < 0:
+                    # Walk left to the bottom level, where the value is read
+                    while slot < n_internal:
+                        slot = 2 * slot + 1
+                    self.leaf_value[i, slot] = depth + _average_path_length([t.n_node_samples[node]])[0]
+                    continue
+                self.feature[i, slot] = features[t.feature[node]]
+                self.threshold[i, slot] = t.threshold[node]
+                stack.append((t.children_left[node], 2 * slot + 1, depth + 1))
+                stack.append((t.children_right[node], 2 * slot + 2, depth + 1))
+
+        # Flatten so a single take() indexes every tree at once
+        self._tree_base = (np.arange(len(trees), dtype=np.int32) * n_internal)[None, :]
+        self._leaf_base = (np.arange(len(trees)) * n_slots)[None, :]
+        self.feature = self.feature.ravel()
+        self.threshold = self.threshold.ravel()
+        self.leaf_value = self.leaf_value.ravel()
+        self.offset = detector.offset_
+        self._normalizer = len(trees) * float(_average_path_length([detector.max_samples_])[0])
+
+    def score_samples(self, X):
+        """Same as IsolationForest.score_samples (lower is more abnormal)"""
+        # Trees split on float32 inputs
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n_rows, n_features = X.shape
+        row_base = (np.arange(n_rows, dtype=np.int32) * n_features)[:, None]
+        X = X.ravel()
+        slot = np.zeros((n_rows, self._tree_base.shape[1]), dtype=np.int32)
+        for _ in range(self.max_depth):
+            internal = slot + self._tree_base
+            values = X.take(row_base + self.feature.take(internal))
+            slot = 2 * slot + 1 + (values > self.threshold.take(internal))
+        depths = self.leaf_value.take(slot + self._leaf_base).sum(axis=1)
+        if self._normalizer == 0:
+            return -np.ones(n_rows)
+        return -(2.0 ** (-depths / self._normalizer))
+
+    def predict(self, X):
+        """+1 for inliers, -1 for anomalies"""
+        return np.where(self.score_samples(X) - self.offset < 0, -1, 1)
+
+
+class StreamingAnomalyScorer:
+    """Score live activity updates against the fitted anomaly detector.
+
+    Keeps one row of state per customer: activity counters as exponentially
+    decayed counts over ``window_days`` (so a counter at steady state equals
+    the events seen in one window, like the batch columns) and the latest
+    balances. Each batch of updates is folded into the state and only the
+    customers it touches are rescored, so cost scales with the update rate
+    rather than the population. An alert is raised when a customer flips
+    from normal to anomalous.
+    """
+
+    def __init__(self, analytics, window_days=30, on_alert=None):
+        df = analytics.df
+        self.customer_ids = df['customer_id'].to_numpy(dtype=np.int64)
+        self._order = np.argsort(self.customer_ids, kind='stable')
+        self._sorted_ids = self.customer_ids[self._order]
+
+        self.state = df[_STATE_COLS].fillna(0).to_numpy(dtype=np.float64)
+        self.last_seen = np.full(len(df), -1, dtype=np.int64)
+        # Time of the latest applied update per customer and balance field
+        self.balance_seen = np.full((len(df), len(BALANCE_FIELDS)), -1, dtype=np.int64)
+        self.is_anomaly = df['is_anomaly'].to_numpy(dtype=bool).copy()
+        self.window_seconds = window_days * 86400
+
+        self._mean = analytics.scaler.mean_
+        self._scale = analytics.scaler.scale_
+        self.forest = CompiledIsolationForest(analytics.anomaly_detector)
+        self.on_alert = on_alert
+
+        self._activity_cols = np.array([_COL[f] for f in ACTIVITY_FIELDS])
+        self._update_cols = np.array([_COL[f] for f in UPDATE_FIELDS])
+        self.updates_seen = 0
+        self.alerts_raised = 0
+
+    def _features(self, state):
+        """Rebuild the segmentation features from raw state rows"""
+        c = _COL
+        digital = (state[:, c['app_logins']] * 0.5 + state[:, c['social_posts']] * 0.3
+                   + state[:, c['rewards_claimed']] * 0.2)
+        ecommerce = (state[:, c['online_purchases']] * 0.6 + state[:, c['mobile_payments']] * 0.4
+                     - state[:, c['abandoned_carts']] * 0.2)
+        total_assets = (state[:, c['checking_balance']] + state[:, c['savings_balance']]
+                        + state[:, c['investment_balance']])
+        clv = state[:, c['income']] * 0.05 + total_assets * 0.01 + digital * 10
+        derived = {
+            'digital_engagement_score': digital,
+            'ecommerce_activity_score': ecommerce,
+            'clv': clv
+        }
+        columns = [derived[f] if f in derived else state[:, c[f]] for f in SEGMENT_FEATURES]
+        return np.column_stack(columns)
+
+    def process(self, updates):
+        """Apply a batch of updates and return the alerts it raised"""
+        ids = np.asarray(updates['customer_id'], dtype=np.int64)
+        self.updates_seen += len(ids)
+        if len(ids) == 0:
+            return np.empty(0, dtype=ALERT_DTYPE)
+
+        pos = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self._sorted_ids) - 1)
+        known = self._sorted_ids[pos] == ids
+        timestamps = np.asarray(updates['timestamp'], dtype=np.int64)[known]
+        order = np.argsort(timestamps, kind='stable')
+        rows = self._order[pos[known]][order]
+        timestamps = timestamps[order]
+        fields = np.asarray(updates['field'], dtype=np.intp)[known][order]
+        values = np.asarray(updates['value'], dtype=np.float64)[known][order]
+        if len(rows) == 0:
+            return np.empty(0, dtype=ALERT_DTYPE)
+
+        # Bring each touched customer forward to their own latest time (never
+        # backwards, so a late update can't rewind the clock), then add each
+        # increment already decayed from its own timestamp to that time
+        now = int(timestamps[-1])
+        touched, inverse = np.unique(rows, return_inverse=True)
+        last = self.last_seen[touched]
+        latest = last.copy()
+        np.maximum.at(latest, inverse, timestamps)
+        decay = np.where(last >= 0, np.exp(-(latest - last) / self.window_seconds), 1.0)
+        self.state[touched[:, None], self._activity_cols] *= decay[:, None]
+        self.last_seen[touched] = latest
+
+        cols = self._update_cols[fields]
+        is_activity = fields < len(ACTIVITY_FIELDS)
+        age = latest[inverse] - timestamps
+        weights = np.exp(-age[is_activity] / self.window_seconds)
+        np.add.at(self.state, (rows[is_activity], cols[is_activity]), values[is_activity] * weights)
+        # Timestamp order means the latest balance in the batch wins; balances
+        # older than the one already applied are dropped
+        balance_rows = rows[~is_activity]
+        balance_fields = fields[~is_activity] - len(ACTIVITY_FIELDS)
+        balance_times = timestamps[~is_activity]
+        fresh = balance_times >= self.balance_seen[balance_rows, balance_fields]
+        self.state[balance_rows[fresh], cols[~is_activity][fresh]] = values[~is_activity][fresh]
+        np.maximum.at(self.balance_seen, (balance_rows, balance_fields), balance_times)
+
+        scaled = (self._features(self.state[touched]) - self._mean) / self._scale
+        scores = self.forest.score_samples(scaled)
+        flagged = scores - self.forest.offset < 0
+        raised = flagged & ~self.is_anomaly[touched]
+        self.is_anomaly[touched] = flagged
+
+        alerts = np.empty(int(raised.sum()), dtype=ALERT_DTYPE)
+        alerts['customer_id'] = self.customer_ids[touched[raised]]
+        alerts['timestamp'] = now
+        alerts['score'] = scores[raised]
+        self.alerts_raised += len(alerts)
+        if len(alerts) and self.on_alert is not None:
+            self.on_alert(alerts)
+        return alerts
+
+    def update(self, customer_id, field, value, timestamp):
+        """Apply a single update; returns True if it raised an alert.
+
+        Each call pays the full per-batch numpy overhead (a few hundred
+        microseconds), so feed streams through ``process`` or ``replay``
+        and keep this for occasional one-off updates.
+        """
+        update = np.array([(customer_id, timestamp, UPDATE_FIELDS.index(field), value)],
+                          dtype=UPDATE_DTYPE)
+        return len(self.process(update)) > 0
+
+    def replay(self, updates, batch_size=4096):
+        """Feed a recorded update stream through in micro-batches"""
+        for start in range(0, len(updates), batch_size):
+            alerts = self.process(updates[start:start + batch_size])
+            if len(alerts):
+                yield alerts
+
+    def customer_alerts(self, customer_id):
+        """Live alert messages for one customer"""
+        pos = np.searchsorted(self._sorted_ids, customer_id)
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == customer_id:
+            if self.is_anomaly[self._order[pos]]:
+                return [ALERT_MESSAGE]
+        return []
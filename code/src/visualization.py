@@ -1,5 +1,8 @@
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from sklearn.decomposition import PCA
 
 def create_spending_profile(customer, spending_cols=None):
     """Create a spending profile visualization"""
@@ -24,15 +27,39 @@ def create_spending_profile(customer, spending_cols=None):
     )
     return fig
 
-def create_financial_health_radar(customer):
-    """Create a radar chart of financial health"""
-    metrics = {
-        'Debt-to-Income': min(1, customer['debt_to_income']),
-        'Savings Ratio': min(1, customer['savings_ratio'] * 5),
-        'Investment Ratio': min(1, customer['investment_ratio']),
-        'Credit Score': customer['credit_score'] / 850,
-        'Digital Engagement': customer['digital_engagement_score'] / 100
-    }
+# Radar axes: label -> (metric, scaling into 0..1)
+RADAR_METRICS = {
+    'Debt-to-Income': ('debt_to_income', lambda v: min(1, v)),
+    'Savings Ratio': ('savings_ratio', lambda v: min(1, v * 5)),
+    'Investment Ratio': ('investment_ratio', lambda v: min(1, v)),
+    'Credit Score': ('credit_score', lambda v: v / 850),
+    'Digital Engagement': ('digital_engagement_score', lambda v: v / 100)
+}
+
+def ordinal(n):
+    """1st, 2nd, 3rd, 4th, ..."""
+    n = int(n)
+    suffix = 'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+def peer_percentile_text(customer, metric):
+    """'62nd percentile in segment, 55th overall', or '' without ranks"""
+    segment_pct = customer.get(f'{metric}_segment_pct')
+    overall_pct = customer.get(f'{metric}_pct')
+    if segment_pct is None or overall_pct is None:
+        return ''
+    return f"{ordinal(segment_pct)} percentile in segment, {ordinal(overall_pct)} overall"
+
+def create_financial_health_radar(customer, peer_benchmark=None):
+    """Create a radar chart of financial health.
+
+    ``peer_benchmark`` (metric -> value, e.g. the segment medians from
+    ``analytics.peer_benchmarks``) replaces the fixed ideal benchmark.
+    Precomputed percentile columns on the customer show up on hover.
+    """
+    metrics = {label: scale(customer[metric]) for label, (metric, scale) in RADAR_METRICS.items()}
+    hover = [peer_percentile_text(customer, metric) or label
+             for label, (metric, _) in RADAR_METRICS.items()]
     
     fig = go.Figure()
     
@@ -41,22 +68,30 @@ def create_financial_health_radar(customer):
         theta=list(metrics.keys()),
         fill='toself',
         name='Your Metrics',
+        hovertext=hover,
         line_color='#4E79A7'
     ))
     
-    # Add benchmark values
-    ideal_values = {
-        'Debt-to-Income': 0.35,
-        'Savings Ratio': 0.2 * 5,
-        'Investment Ratio': 0.3,
-        'Credit Score': 750/850,
-        'Digital Engagement': 0.7
-    }
+    if peer_benchmark is not None:
+        benchmark_name = 'Segment Median'
+        benchmark_values = {
+            label: scale(peer_benchmark[metric]) for label, (metric, scale) in RADAR_METRICS.items()
+        }
+    else:
+        # Add benchmark values
+        benchmark_name = 'Ideal Benchmark'
+        benchmark_values = {
+            'Debt-to-Income': 0.35,
+            'Savings Ratio': 0.2 * 5,
+            'Investment Ratio': 0.3,
+            'Credit Score': 750/850,
+            'Digital Engagement': 0.7
+        }
     
     fig.add_trace(go.Scatterpolar(
-        r=list(ideal_values.values()),
-        theta=list(ideal_values.keys()),
-        name='Ideal Benchmark',
+        r=list(benchmark_values.values()),
+        theta=list(benchmark_values.keys()),
+        name=benchmark_name,
         line_color='#59A14F'
     ))
     
@@ -125,3 +160,119 @@ def create_trend_projection(customer):
     )
     
     return fig
+
+METRIC_LABELS = {'clv': 'Average CLV', 'anomaly_rate': 'Anomaly Rate'}
+
+def _binned_range(values, bins, clip_quantiles=(0.001, 0.999)):
+    """Bin edges over the bulk of the data so outliers don't flatten the view"""
+    low, high = np.quantile(values, clip_quantiles) if len(values) else (0.0, 1.0)
+    if high <= low:
+        high = low + 1
+    return np.linspace(low, high, bins + 1)
+
+def create_segment_scatter(analytics, color_by='segment_name', bins=150, sample_size=100_000):
+    """Population segment map over the first two principal components.
+
+    The projection is fitted on a sample of the scaled features, then every
+    customer is binned into a ``bins`` x ``bins`` grid per group. Each
+    occupied cell becomes one WebGL marker sized by its customer count, so
+    the payload depends on the grid, not on the number of customers.
+    """
+    X = np.asarray(analytics.scaled_features)
+    rng = np.random.default_rng(42)
+    sample = X if len(X) <= sample_size else X[rng.choice(len(X), sample_size, replace=False)]
+    pca = PCA(n_components=2, random_state=42).fit(sample)
+    projected = pca.transform(X)
+
+    x_edges = _binned_range(projected[:, 0], bins)
+    y_edges = _binned_range(projected[:, 1], bins)
+    x_cell = np.clip(np.searchsorted(x_edges, projected[:, 0], side='right') - 1, 0, bins - 1)
+    y_cell = np.clip(np.searchsorted(y_edges, projected[:, 1], side='right') - 1, 0, bins - 1)
+    x_mid = (x_edges[:-1] + x_edges[1:]) / 2
+    y_mid = (y_edges[:-1] + y_edges[1:]) / 2
+
+    groups, names = pd.factorize(analytics.df[color_by].to_numpy(), sort=True)
+    counts = np.bincount(
+        (groups * bins + x_cell) * bins + y_cell, minlength=len(names) * bins * bins
+    ).reshape(len(names), bins, bins)
+
+    fig = go.Figure()
+    colors = px.colors.qualitative.Set2
+    for g, name in enumerate(names):
+        xi, yi = np.nonzero(counts[g])
+        n = counts[g, xi, yi]
+        fig.add_trace(go.Scattergl(
+            x=x_mid[xi],
+            y=y_mid[yi],
+            mode='markers',
+            name=str(name),
+            customdata=n,
+            hovertemplate='%{customdata:,} customers<extra>' + str(name) + '</extra>',
+            marker=dict(
+                size=np.clip(2 + 2 * np.log2(n), 2, 16),
+                color=colors[g % len(colors)],
+                opacity=0.6
+            )
+        ))
+    fig.update_layout(
+        title=f"Customer Segments ({len(X):,} customers)",
+        xaxis_title=f"PC1 ({pca.explained_variance_ratio_[0]:.0%} of variance)",
+        yaxis_title=f"PC2 ({pca.explained_variance_ratio_[1]:.0%} of variance)",
+        height=500
+    )
+    return fig
+
+def create_state_choropleth(df, metric='clv'):
+    """US state map of a metric's average, or ``'anomaly_rate'``"""
+    column = 'is_anomaly' if metric == 'anomaly_rate' else metric
+    by_state = df.groupby('state', observed=True).agg(
+        value=(column, 'mean'), customers=(column, 'size')
+    ).reset_index()
+
+    title = METRIC_LABELS.get(metric, f"Average {metric.replace('_', ' ').title()}")
+    fig = go.Figure(go.Choropleth(
+        locations=by_state['state'].astype(str),
+        locationmode='USA-states',
+        z=by_state['value'],
+        customdata=by_state['customers'],
+        hovertemplate='%{location}: %{z:,.3f}<br>%{customdata:,} customers<extra></extra>',
+        colorscale='Reds' if metric == 'anomaly_rate' else 'Blues',
+        colorbar_title=title
+    ))
+    fig.update_layout(
+        title=f"{title} by State",
+        geo=dict(scope='usa'),
+        height=450,
+        margin=dict(t=50, b=20, l=20, r=20)
+    )
+    return fig
+
+def create_density_map(df, x='income', y='credit_score', bins=100):
+    """Binned customer density over two columns, as a heatmap.
+
+    Values beyond the 0.1%/99.9% quantiles are counted in the edge bins.
+    """
+    x_values = df[x].to_numpy(dtype=np.float64)
+    y_values = df[y].to_numpy(dtype=np.float64)
+    x_edges = _binned_range(x_values, bins)
+    y_edges = _binned_range(y_values, bins)
+    x_values = np.clip(x_values, x_edges[0], x_edges[-1])
+    y_values = np.clip(y_values, y_edges[0], y_edges[-1])
+    counts, _, _ = np.histogram2d(x_values, y_values, bins=[x_edges, y_edges])
+
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.log10(counts.T + 1),
+        customdata=counts.T,
+        hovertemplate=f'{x}: %{{x:,.0f}}<br>{y}: %{{y:,.0f}}<br>%{{customdata:,.0f}} customers<extra></extra>',
+        colorscale='Viridis',
+        colorbar=dict(title='log10 customers')
+    ))
+    fig.update_layout(
+        title=f"Customer Density: {x.replace('_', ' ').title()} vs {y.replace('_', ' ').title()}",
+        xaxis_title=x.replace('_', ' ').title(),
+        yaxis_title=y.replace('_', ' ').title(),
+        height=450
+    )
+    return fig
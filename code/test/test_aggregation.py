@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.aggregation import TransactionAggregator, aggregate_transactions
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import (
+    generate_synthetic_banking_data,
+    generate_transaction_events,
+    load_transaction_events,
+    SPENDING_CATEGORIES,
+    TRANSACTION_DTYPE
+)
+
+@pytest.fixture
+def customers():
+    return generate_synthetic_banking_data(50)
+
+@pytest.fixture
+def events_path(customers, tmp_path):
+    path = tmp_path / 'events.npy'
+    generate_transaction_events(customers, path, days=60)
+    return path
+
+def make_events(rows):
+    return np.array(rows, dtype=TRANSACTION_DTYPE)
+
+def test_counts_match_groupby(customers, events_path):
+    result = aggregate_transactions(customers, events_path, chunk_size=500)
+    events = pd.DataFrame(load_transaction_events(events_path))
+    expected = events.groupby(['customer_id', 'category']).size().unstack(fill_value=0)
+
+    for code, category in enumerate(SPENDING_CATEGORIES):
+        got = result.set_index('customer_id')[category]
+        want = expected[code].reindex(got.index, fill_value=0)
+        assert (got == want).all()
+
+def test_chunking_does_not_change_result(customers, events_path):
+    small = aggregate_transactions(customers, events_path, chunk_size=97)
+    large = aggregate_transactions(customers, events_path, chunk_size=10**6)
+    pd.testing.assert_frame_equal(small, large)
+
+def test_rolling_window_uses_latest_event():
+    aggregator = TransactionAggregator([1, 2], window_days=7)
+    day = 86400
+    # Out-of-order chunks: the newest event arrives first
+    aggregator.update(make_events([(1, 100 * day, 0, 10.0)]))
+    aggregator.update(make_events([(1, 95 * day, 0, 5.0), (2, 80 * day, 1, 7.0)]))
+    frame = aggregator.to_frame()
+
+    assert list(frame['transactions_7d']) == [2, 0]
+    assert list(frame['amount_7d']) == [15.0, 0.0]
+    assert list(frame['groceries']) == [2, 0]
+    assert list(frame['dining']) == [0, 1]
+
+def test_unknown_customers_are_counted():
+    aggregator = TransactionAggregator([1])
+    aggregator.update(make_events([(1, 0, 0, 1.0), (99, 0, 0, 1.0)]))
+    assert aggregator.events_seen == 2
+    assert aggregator.unknown_events == 1
+
+def test_output_feeds_analytics(customers, events_path):
+    features = aggregate_transactions(customers, events_path)
+    analytics = BankingCustomerAnalytics(features)
+    assert len(analytics.df) == len(customers)
+    assert (analytics.df['total_spending'] == features['total_spending']).all()
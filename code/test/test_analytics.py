@@ -2,7 +2,7 @@ import pytest
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-from src.analytics import BankingCustomerAnalytics
+from src.analytics import BankingCustomerAnalytics, PEER_METRICS, percentile_ranks, score_churn_risk
 from src.data_generation import generate_synthetic_banking_data
 
 @pytest.fixture
@@ -114,3 +114,57 @@ def test_numeric_features(analytics_instance):
     ]
     for col in numeric_cols:
         assert pd.api.types.is_numeric_dtype(analytics_instance.df[col])
+
+def test_full_training_report(analytics_instance):
+    """Test the full-fit report mirrors the sample-mode one"""
+    report = analytics_instance.training_report
+    assert report['mode'] == 'full'
+    assert report['sample_size'] == report['population'] == len(analytics_instance.df)
+    assert set(report['timings']) == {'fit', 'assign'}
+
+def test_sample_then_assign_training():
+    """Test fitting on a stratified sample and assigning everyone"""
+    analytics = BankingCustomerAnalytics(
+        generate_synthetic_banking_data(400), training_sample=150, chunk_size=64
+    )
+    df = analytics.df
+    assert analytics.training_report['mode'] == 'sample'
+    assert analytics.training_report['sample_size'] < len(df)
+    assert df['segment'].notna().all()
+    assert df['segment_name'].notna().all()
+    assert df['is_anomaly'].dtype == bool
+    assert analytics.scaled_features.shape == (400, 10)
+
+    stability = analytics.segment_stability(n_init=5)
+    assert -1 <= stability['adjusted_rand_index'] <= 1
+    assert 0 < stability['matched_share'] <= 1
+    assert stability['anomaly_agreement'] > 0.8
+
+def test_churn_risk(analytics_instance):
+    """Test churn-risk scoring from satisfaction and engagement signals"""
+    df = analytics_instance.df
+    assert df['churn_risk'].between(0, 1).all()
+    assert set(df['churn_risk_category']) <= {'Low', 'Medium', 'High'}
+
+    unhappy = df.iloc[[0]].copy()
+    unhappy[['nps_score', 'csat', 'complaints', 'app_logins']] = [0, 1, 3, 10]
+    happy = df.iloc[[0]].copy()
+    happy[['nps_score', 'csat', 'complaints', 'app_logins']] = [10, 5, 0, 150]
+    assert score_churn_risk(unhappy)[0] > score_churn_risk(happy)[0]
+
+def test_peer_percentiles(analytics_instance):
+    """Test overall and within-segment percentile ranks"""
+    df = analytics_instance.df
+    for metric in PEER_METRICS:
+        overall = df[f'{metric}_pct']
+        within = df[f'{metric}_segment_pct']
+        assert overall.dtype == np.uint8 and within.dtype == np.uint8
+        expected = df[metric].rank(method='max').astype(int) * 100 // len(df)
+        assert (overall.astype(int) == expected).all()
+        sizes = df.groupby('segment')[metric].transform('size')
+        expected = df.groupby('segment')[metric].rank(method='max').astype(int) * 100 // sizes
+        assert (within.astype(int) == expected).all()
+    assert set(analytics_instance.peer_benchmarks) == set(df['segment_name'])
+
+    ranks = percentile_ranks(np.array([5.0, 1.0, 1.0, 3.0]))
+    assert list(ranks) == [100, 50, 50, 75]
@@ -0,0 +1,86 @@
+import pytest
+from src.analytics import BankingCustomerAnalytics
+from src.cache import RecommendationCache, customer_version
+from src.data_generation import generate_synthetic_banking_data
+from src.recommendations import BankingRecommendationEngine
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture(scope='module')
+def analytics_instance():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(50))
+
+def test_hit_and_miss_counters():
+    cache = RecommendationCache(max_entries=10)
+    assert cache.get('recommendations', 1, 'v1') is None
+    cache.put('recommendations', 1, 'v1', {'alerts': []})
+    assert cache.get('recommendations', 1, 'v1') == {'alerts': []}
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+def test_version_change_invalidates_entry():
+    cache = RecommendationCache(max_entries=10)
+    cache.put('recommendations', 1, 'v1', 'old')
+    cache.put('recommendations', 2, 'v1', 'other')
+    assert cache.get('recommendations', 1, 'v2') is None
+    assert cache.invalidations == 1
+    assert cache.get('recommendations', 2, 'v1') == 'other'
+
+def test_lru_eviction():
+    cache = RecommendationCache(max_entries=2)
+    cache.put('recommendations', 1, 'v', 'a')
+    cache.put('recommendations', 2, 'v', 'b')
+    cache.get('recommendations', 1, 'v')
+    cache.put('recommendations', 3, 'v', 'c')
+    assert cache.evictions == 1
+    assert cache.get('recommendations', 2, 'v') is None
+    assert cache.get('recommendations', 1, 'v') == 'a'
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = RecommendationCache(max_entries=10, ttl=60, clock=clock)
+    cache.put('dashboard', 1, 'v', 'payload')
+    clock.now = 61
+    assert cache.get('dashboard', 1, 'v') is None
+    assert cache.evictions == 1
+
+def test_engine_uses_cache(analytics_instance):
+    cache = RecommendationCache()
+    engine = BankingRecommendationEngine(analytics_instance, cache=cache)
+    customer_id = analytics_instance.df['customer_id'].iloc[0]
+    first = engine.generate_recommendations(customer_id)
+    second = engine.generate_recommendations(customer_id)
+    assert first == second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_row_update_changes_version(analytics_instance):
+    customer = analytics_instance.df.iloc[0].copy()
+    before = customer_version(customer, analytics_instance.model_version)
+    customer['credit_card_balance'] += 100
+    assert customer_version(customer, analytics_instance.model_version) != before
+    assert customer_version(customer, analytics_instance.model_version + 1) != \
+        customer_version(customer, analytics_instance.model_version)
+
+def test_segment_stats_change_invalidates_peers():
+    analytics = BankingCustomerAnalytics(generate_synthetic_banking_data(50))
+    cache = RecommendationCache()
+    engine = BankingRecommendationEngine(analytics, cache=cache)
+    df = analytics.df
+    customer = df.iloc[0]
+    first = engine.recommend(customer)
+
+    # Other customers in the segment become far more active; the customer's
+    # own row is unchanged but the segment median behind the advice moved
+    peers = (df['segment'] == customer['segment']) & (df.index != customer.name)
+    df.loc[peers, 'app_logins'] = 10_000
+    analytics.refresh_peer_stats()
+    second = engine.recommend(customer)
+    assert cache.invalidations == 1
+    assert "Enable push notifications to increase app engagement" in second['digital_services']
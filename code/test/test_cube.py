@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.analytics import BankingCustomerAnalytics
+from src.cube import SegmentCube
+from src.data_generation import generate_synthetic_banking_data
+
+@pytest.fixture(scope='module')
+def df():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(300)).df
+
+def test_rollup_matches_groupby(df):
+    cube = SegmentCube.from_frame(df)
+    result = cube.query(by=['segment_name', 'life_stage'])
+    expected = df.groupby(['segment_name', 'life_stage']).agg(
+        customers=('customer_id', 'size'),
+        clv_sum=('clv', 'sum'),
+        avg_debt_to_income=('debt_to_income', 'mean'),
+        avg_nps_score=('nps_score', 'mean')
+    )
+    result = result.loc[expected.index]
+    assert (result['customers'] == expected['customers']).all()
+    np.testing.assert_allclose(result['clv_sum'], expected['clv_sum'])
+    np.testing.assert_allclose(result['avg_debt_to_income'], expected['avg_debt_to_income'])
+    np.testing.assert_allclose(result['avg_nps_score'], expected['avg_nps_score'])
+
+def test_slice(df):
+    cube = SegmentCube.from_frame(df)
+    result = cube.query(by='state', where={'is_anomaly': True, 'sentiment_category': ['Positive', 'Neutral']})
+    subset = df[df['is_anomaly'] & df['sentiment_category'].isin(['Positive', 'Neutral'])]
+    expected = subset.groupby('state').size()
+    assert (result['customers'].loc[expected.index] == expected).all()
+    assert result['customers'].sum() == len(subset)
+
+def test_total(df):
+    total = SegmentCube.from_frame(df).total()
+    assert total['customers'] == len(df)
+    assert total['clv_sum'] == pytest.approx(df['clv'].sum())
+
+def test_incremental_maintenance(df):
+    first, second = df.iloc[:200], df.iloc[200:]
+    cube = SegmentCube.from_frame(first).add(second)
+    full = SegmentCube.from_frame(df)
+    pd.testing.assert_frame_equal(cube.query(by='segment_name').sort_index(),
+                                  full.query(by='segment_name').sort_index())
+
+    # Rescore a customer into a new, previously unseen state
+    old = df.iloc[[0]]
+    new = old.copy()
+    new['state'] = 'PR'
+    new['clv'] = new['clv'] + 1000
+    full.update(old, new)
+    assert full.query(by='state').loc['PR', 'customers'] == 1
+    assert full.total()['clv_sum'] == pytest.approx(df['clv'].sum() + 1000)
+    assert full.total()['customers'] == len(df)
+
+def test_slice_on_grouped_dimension(df):
+    cube = SegmentCube.from_frame(df)
+    result = cube.query(by='state', where={'state': ['CA', 'NY']})
+    expected = df[df['state'].isin(['CA', 'NY'])].groupby('state').size()
+    assert set(result.index) == set(expected.index)
+    assert (result['customers'].loc[expected.index] == expected).all()
+
+    result = cube.query(by=['segment_name', 'is_anomaly'], where={'is_anomaly': True})
+    expected = df[df['is_anomaly']].groupby(['segment_name', 'is_anomaly']).size()
+    assert (result['customers'].loc[expected.index] == expected).all()
+    assert result['customers'].sum() == df['is_anomaly'].sum()
+
+def test_slice_on_other_dimension(df):
+    cube = SegmentCube.from_frame(df)
+    result = cube.query(by=['segment_name', 'life_stage'], where={'state': ['CA', 'NY']})
+    subset = df[df['state'].isin(['CA', 'NY'])]
+    expected = subset.groupby(['segment_name', 'life_stage']).size()
+    assert (result['customers'].loc[expected.index] == expected).all()
+    assert result['customers'].sum() == len(subset)
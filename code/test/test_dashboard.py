@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import pytest
+import plotly.graph_objects as go
+from src import dashboard
+from src.analytics import BankingCustomerAnalytics
+from src.cache import RecommendationCache
+from src.data_generation import generate_synthetic_banking_data
+from src.recommendations import BankingRecommendationEngine
+
+@pytest.fixture(scope='module')
+def analytics_instance():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(200))
+
+@pytest.fixture
+def customer_id(analytics_instance):
+    return analytics_instance.df['customer_id'].iloc[7]
+
+async def _collect(stream):
+    return [section async for section in stream]
+
+def test_sections_in_display_order(analytics_instance, customer_id):
+    df = analytics_instance.df
+    sections = dict(dashboard.dashboard_sections(customer_id, df, analytics_instance))
+    assert list(sections) == dashboard.SECTIONS
+    assert isinstance(sections['health'], go.Figure)
+    assert df.loc[df['customer_id'] == customer_id, 'name'].iloc[0] in sections['header']
+    assert 'Personalized Recommendations' in sections['recommendations']
+
+def test_stream_yields_every_section(analytics_instance, customer_id):
+    df = analytics_instance.df
+    engine = BankingRecommendationEngine(analytics_instance)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        streamed = asyncio.run(_collect(dashboard.stream_dashboard(
+            customer_id, df, analytics_instance, engine=engine, executor=executor
+        )))
+    names = [name for name, _ in streamed]
+    assert names[0] == 'header'
+    assert sorted(names) == sorted(dashboard.SECTIONS)
+
+    expected = dict(dashboard.dashboard_sections(customer_id, df, analytics_instance, engine=engine))
+    streamed = dict(streamed)
+    for name in ('header', 'insights', 'recommendations'):
+        assert streamed[name] == expected[name]
+
+def test_stream_reuses_cached_charts(analytics_instance, customer_id):
+    cache = RecommendationCache()
+    engine = BankingRecommendationEngine(analytics_instance, cache=cache)
+    args = (customer_id, analytics_instance.df, analytics_instance, cache, engine)
+    asyncio.run(_collect(dashboard.stream_dashboard(*args)))
+    misses = cache.misses
+    asyncio.run(_collect(dashboard.stream_dashboard(*args)))
+    assert cache.misses == misses
+    assert cache.hits >= 4  # three charts and the recommendations
+
+def test_missing_customer(analytics_instance):
+    streamed = asyncio.run(_collect(dashboard.stream_dashboard(-1, analytics_instance.df, analytics_instance)))
+    assert [name for name, _ in streamed] == ['error']
+    with mock.patch.object(dashboard, 'display') as display:
+        dashboard.generate_dashboard(-1, analytics_instance.df, analytics_instance)
+    assert 'Customer not found' in display.call_args[0][0].data
+
+def test_generate_dashboard_async_renders_in_layout_order(analytics_instance, customer_id):
+    engine = BankingRecommendationEngine(analytics_instance)
+    shown = []
+
+    def fake_display(obj, display_id=False):
+        handle = mock.Mock()
+        shown.append((obj.data, handle))
+        return handle
+
+    # Make the recommendations finish first and the charts in reverse order
+    arrival = {'recommendations': 0, 'trend': 1, 'health': 2, 'spending': 3}
+    stream = dashboard.stream_dashboard
+
+    async def reordered(*args, **kwargs):
+        sections = [section async for section in stream(*args, **kwargs)]
+        for name, payload in sorted(sections, key=lambda s: arrival.get(s[0], -1)):
+            yield name, payload
+
+    with mock.patch.object(dashboard, 'display', side_effect=fake_display), \
+            mock.patch.object(dashboard, 'stream_dashboard', reordered):
+        sections = asyncio.run(dashboard.generate_dashboard_async(
+            customer_id, analytics_instance.df, analytics_instance, engine=engine
+        ))
+    assert set(sections) == set(dashboard.SECTIONS)
+
+    # Headings and one empty slot per section, laid out before anything renders
+    expected = []
+    for name in dashboard.SECTIONS:
+        if name in dashboard.SECTION_HEADINGS:
+            expected.append(dashboard.SECTION_HEADINGS[name])
+        expected.append('')
+    assert [data for data, _ in shown] == expected
+
+    slots = [handle for data, handle in shown if data == '']
+    for name, handle in zip(dashboard.SECTIONS, slots):
+        rendered = handle.update.call_args[0][0]
+        payload = sections[name]
+        if isinstance(payload, go.Figure):
+            assert rendered is payload
+        else:
+            assert rendered.data == (payload or '')
+
+def test_engine_lookup(analytics_instance, customer_id):
+    engine = BankingRecommendationEngine(analytics_instance)
+    assert engine.find_customer(customer_id)['customer_id'] == customer_id
+    assert engine.find_customer(-1) is None
+    assert engine.generate_recommendations(customer_id) == engine.recommend(engine.find_customer(customer_id))
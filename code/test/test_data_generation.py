@@ -1,5 +1,13 @@
 import pytest
-from src.data_generation import generate_synthetic_banking_data
+import numpy as np
+import pandas as pd
+from src.data_generation import (
+    generate_synthetic_banking_data,
+    generate_transaction_events,
+    load_transaction_events,
+    SPENDING_CATEGORIES,
+    TRANSACTION_DTYPE
+)
 
 def test_data_generation():
     df = generate_synthetic_banking_data(10)
@@ -7,3 +15,30 @@ def test_data_generation():
     assert 'customer_id' in df.columns
     assert 'name' in df.columns
     assert 'income' in df.columns
+
+def test_transaction_events(tmp_path):
+    customers = generate_synthetic_banking_data(20)
+    path = tmp_path / 'events.npy'
+    total = generate_transaction_events(customers, path, days=30, chunk_size=100)
+    events = load_transaction_events(path)
+
+    assert len(events) == total > 0
+    assert events.dtype == TRANSACTION_DTYPE
+    assert set(np.unique(events['customer_id'])) <= set(customers['customer_id'])
+    assert events['category'].max() < len(SPENDING_CATEGORIES)
+    assert (events['amount'] > 0).all()
+    assert np.ptp(events['timestamp']) < 30 * 86400
+    # Default start is 2024-01-01 UTC whatever the host timezone
+    assert 1704067200 <= events['timestamp'].min() < 1704067200 + 30 * 86400
+
+def test_transaction_volume_follows_income(tmp_path):
+    customers = generate_synthetic_banking_data(200)
+    path = tmp_path / 'events.npy'
+    generate_transaction_events(customers, path)
+    events = load_transaction_events(path)
+
+    counts = pd.Series(events['customer_id']).value_counts()
+    incomes = customers.set_index('customer_id')['income']
+    rich = incomes >= incomes.median()
+    assert counts.reindex(incomes[rich].index, fill_value=0).mean() > \
+        counts.reindex(incomes[~rich].index, fill_value=0).mean()
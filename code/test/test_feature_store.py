@@ -0,0 +1,78 @@
+import os
+import pytest
+import numpy as np
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
+from src.feature_store import FeatureStore, INDEX_FILE, write_feature_store
+
+@pytest.fixture(scope='module')
+def analytics_instance():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(60))
+
+@pytest.fixture
+def store(analytics_instance, tmp_path):
+    write_feature_store(analytics_instance, tmp_path)
+    return FeatureStore(tmp_path)
+
+def test_round_trip(analytics_instance, store):
+    df = analytics_instance.df
+    assert len(store) == len(df)
+    np.testing.assert_allclose(store['clv'], df['clv'])
+    assert (store['is_anomaly'] == df['is_anomaly'].to_numpy()).all()
+    np.testing.assert_allclose(store.scaled_features, analytics_instance.scaled_features)
+    assert store.model_version == analytics_instance.model_version
+
+def test_columns_are_read_only_memory_maps(store):
+    assert isinstance(store['income'], np.memmap)
+    assert not store['income'].flags.writeable
+    with pytest.raises(ValueError):
+        store['income'][0] = 1
+
+def test_customer_lookup(analytics_instance, store):
+    row = analytics_instance.df.iloc[5]
+    record = store.customer(row['customer_id'])
+    assert record['income'] == row['income']
+    assert record['segment_name'] == row['segment_name']
+    assert store.customer(-1) is None
+
+def test_non_contiguous_ids(tmp_path):
+    data = generate_synthetic_banking_data(60).iloc[::-2].reset_index(drop=True)
+    analytics = BankingCustomerAnalytics(data)
+    write_feature_store(analytics, tmp_path)
+    store = FeatureStore(tmp_path)
+    customer_id = analytics.df['customer_id'].iloc[3]
+    assert store.row_of(customer_id) == 3
+    assert store.row_of(customer_id + 1) is None
+    # The id index is written once with the store, not rebuilt per reader
+    assert os.path.exists(os.path.join(store.version_path, INDEX_FILE))
+    assert isinstance(store._sorted_ids, np.memmap)
+
+def test_rewrite_while_reader_attached(analytics_instance, tmp_path):
+    write_feature_store(analytics_instance, tmp_path)
+    reader = FeatureStore(tmp_path)
+    expected = analytics_instance.df['clv'].to_numpy()
+
+    smaller = BankingCustomerAnalytics(generate_synthetic_banking_data(20))
+    write_feature_store(smaller, tmp_path)
+
+    # The old mappings still point at the files they opened
+    assert len(reader['clv']) == len(expected)
+    np.testing.assert_allclose(reader['clv'], expected)
+    assert float(np.asarray(reader.scaled_features).sum()) == pytest.approx(
+        float(analytics_instance.scaled_features.sum()))
+    assert len(FeatureStore(tmp_path)) == 20
+    assert not list(tmp_path.glob('*.tmp'))
+
+def test_rewrite_keeps_versions_consistent(analytics_instance, tmp_path):
+    for _ in range(3):
+        write_feature_store(analytics_instance, tmp_path)
+    store = FeatureStore(tmp_path)
+    assert os.path.basename(store.version_path) == 'v000003'
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ['v000002', 'v000003']
+
+def test_rejects_column_of_wrong_length(analytics_instance, tmp_path):
+    write_feature_store(analytics_instance, tmp_path)
+    version_path = FeatureStore(tmp_path).version_path
+    np.save(os.path.join(version_path, 'income.npy'), np.zeros(3))
+    with pytest.raises(ValueError, match='income'):
+        FeatureStore(tmp_path)
@@ -0,0 +1,58 @@
+import ast
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
+from src.loader import decode_products, encode_products, load_customer_data
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'customers.csv'
+    generate_synthetic_banking_data(120).to_csv(path, index=False)
+    return path
+
+def test_products_round_trip(csv_path):
+    expected = pd.read_csv(csv_path)['products_used'].apply(ast.literal_eval)
+    df = load_customer_data(csv_path, chunksize=50)
+    for got, want in zip(df['products_used'], expected):
+        assert set(got) == set(want)
+    assert df['products_mask'].dtype == np.uint8
+
+def test_typed_columns(csv_path):
+    df = load_customer_data(csv_path, chunksize=50)
+    assert isinstance(df['state'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['life_stage'].dtype, pd.CategoricalDtype)
+    assert df['credit_score'].dtype == np.int16
+    assert len(df) == 120
+
+def test_column_projection(csv_path):
+    df = load_customer_data(csv_path, columns=['customer_id', 'income', 'products_used'])
+    assert set(df.columns) == {'customer_id', 'income', 'products_used', 'products_mask'}
+
+def test_validation(tmp_path):
+    data = generate_synthetic_banking_data(10)
+    data.loc[0, 'credit_score'] = 900
+    data.loc[1, 'savings_balance'] = -5
+    path = tmp_path / 'bad.csv'
+    data.to_csv(path, index=False)
+    with pytest.raises(ValueError, match='credit_score'):
+        load_customer_data(path)
+    assert len(load_customer_data(path, validate=False)) == 10
+
+def test_unknown_product_rejected():
+    with pytest.raises(ValueError):
+        encode_products(pd.Series(["['checking', 'crypto']"]))
+    assert decode_products(encode_products(pd.Series(['[]'])))[0] == ()
+
+def test_loaded_frame_feeds_analytics(csv_path):
+    df = load_customer_data(csv_path)
+    analytics = BankingCustomerAnalytics(df)
+    reference = BankingCustomerAnalytics(generate_synthetic_banking_data(120))
+    for col in [c for c in reference.df.columns if c.startswith('has_')]:
+        assert (analytics.df[col] == reference.df[col]).all()
+
+def test_repo_sample_file():
+    df = load_customer_data(os.path.join(os.path.dirname(__file__), '..', 'data', 'generated_data.csv'))
+    assert df.loc[0, 'products_used'] == ('checking', 'savings', 'mortgage', 'credit_card')
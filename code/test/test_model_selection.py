@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
+from src.model_selection import select_segmentation_model
+from src.sampling import income_band, stratified_sample
+
+@pytest.fixture
+def analytics_instance():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(300))
+
+def test_stratified_sample_covers_strata(analytics_instance):
+    df = analytics_instance.df
+    idx = stratified_sample(df, 60, ['life_stage'])
+    assert len(np.unique(idx)) == len(idx)
+    assert set(df['life_stage'].iloc[idx]) == set(df['life_stage'])
+    assert 50 <= len(idx) <= 70
+
+def test_stratified_sample_returns_everything_when_small(analytics_instance):
+    assert len(stratified_sample(analytics_instance.df, 10**6, ['state'])) == 300
+
+def test_income_band(analytics_instance):
+    bands = income_band(analytics_instance.df['income'], 5)
+    assert set(bands) == {0, 1, 2, 3, 4}
+
+def test_sweep_reports_every_candidate(analytics_instance):
+    result = select_segmentation_model(
+        analytics_instance, k_values=[3, 4, 5], seeds=[0, 1], sample_size=150, n_jobs=1
+    )
+    assert len(result['scores']) == 6
+    assert result['k'] in (3, 4, 5)
+    assert result['scores']['silhouette'].iloc[0] == result['scores']['silhouette'].max()
+    assert len(result['labels']) == len(analytics_instance.df)
+    assert {'sampling', 'sweep', 'refit', 'total'} <= set(result['timings'])
+
+def test_apply_replaces_segmentation(analytics_instance):
+    version = analytics_instance.model_version
+    result = select_segmentation_model(
+        analytics_instance, k_values=[7], seeds=[0], sample_size=150, n_jobs=1, apply=True
+    )
+    df = analytics_instance.df
+    assert analytics_instance.kmeans is result['model']
+    assert df['segment'].nunique() <= 7
+    assert df['segment_name'].notna().all()
+    assert analytics_instance.segment_names[6] == 'Segment 6'
+    assert analytics_instance.model_version == version + 1
+
+def test_parallel_sweep_matches_serial(analytics_instance):
+    kwargs = dict(k_values=[3, 4], seeds=[0, 1], sample_size=150)
+    serial = select_segmentation_model(analytics_instance, n_jobs=1, **kwargs)
+    parallel = select_segmentation_model(analytics_instance, n_jobs=2, **kwargs)
+    assert (parallel['k'], parallel['seed']) == (serial['k'], serial['seed'])
+    np.testing.assert_allclose(parallel['scores']['silhouette'], serial['scores']['silhouette'])
+    assert (parallel['labels'] == serial['labels']).all()
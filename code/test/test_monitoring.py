@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
+from src.monitoring import MIN_SEGMENT_ROWS, population_stability_index, ks_statistic
+
+@pytest.fixture(scope='module')
+def analytics():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(1000))
+
+@pytest.fixture
+def batch():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(800), fit=False).df
+
+def test_metrics():
+    assert population_stability_index([10, 20, 30], [10, 20, 30]) == pytest.approx(0)
+    assert population_stability_index([10, 20, 30], [30, 20, 10]) > 0.25
+    assert ks_statistic([50, 50], [100, 0]) == pytest.approx(0.5)
+
+def test_same_distribution_is_stable(analytics, batch):
+    monitor = analytics.drift_monitor
+    monitor.reset()
+    report = monitor.update(batch).report()
+    assert report['rows'] == len(batch)
+    assert not report['needs_refit']
+    assert (report['features']['psi'] < 0.25).all()
+    assert report['segments']['current_share'].sum() == pytest.approx(1)
+
+def test_shift_triggers_refit(analytics, batch):
+    batch = batch.copy()
+    batch['income'] *= 3
+    analytics.drift_monitor.reset()
+    report = analytics.drift_monitor.update(batch).report()
+    assert report['needs_refit']
+    assert report['features'].loc['income', 'status'] == 'significant'
+    assert report['features'].loc['credit_score', 'status'] == 'stable'
+
+def test_single_segment_shift_triggers_refit(analytics, batch):
+    monitor = analytics.drift_monitor
+    X = (batch[monitor.features].fillna(0).to_numpy() - monitor._mean) / monitor._scale
+    segments = monitor.kmeans.predict(X)
+    largest = np.bincount(segments).argmax()
+    shifted = batch.copy()
+    shifted.loc[segments == largest, 'credit_score'] -= 40
+
+    monitor.reset()
+    report = monitor.update(shifted).report()
+    assert report['features']['psi'].max() < 0.25
+    assert report['segment_mix_psi'] < 0.25
+    assert report['segments']['max_psi'].iloc[largest] >= 0.25
+    assert report['needs_refit']
+
+    # Segments below min_segment_rows are reported but can't force a refit
+    monitor.min_segment_rows = len(batch) + 1
+    try:
+        assert not monitor.report()['needs_refit']
+    finally:
+        monitor.min_segment_rows = MIN_SEGMENT_ROWS
+
+def test_incremental_matches_single_pass(analytics, batch):
+    monitor = analytics.drift_monitor
+    monitor.reset()
+    monitor.update(batch)
+    expected = monitor.current.copy()
+    monitor.reset()
+    for start in range(0, len(batch), 100):
+        monitor.update(batch.iloc[start:start + 100])
+    np.testing.assert_array_equal(monitor.current, expected)
+    assert monitor.current.shape == monitor.reference.shape
+
+def test_check_drift_from_raw_batch(analytics):
+    analytics.drift_monitor.reset()
+    report = analytics.check_drift(generate_synthetic_banking_data(300))
+    assert report['rows'] == 300
+    assert set(report['segments'].index) == set(analytics.segment_names.values())
@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
+from src.propensity import ProductPropensityModel
+from src.recommendations import BankingRecommendationEngine
+
+@pytest.fixture(scope='module')
+def analytics_instance():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(400))
+
+@pytest.fixture(scope='module')
+def model(analytics_instance):
+    return ProductPropensityModel(analytics_instance)
+
+def test_score_all_shape(analytics_instance, model):
+    scores = model.score_all(chunk_size=128)
+    assert scores.shape == (len(analytics_instance.df), len(model.products))
+    assert ((scores > 0) & (scores < 1)).all()
+
+def test_top_k_matches_full_sort(analytics_instance, model):
+    top = model.top_k('investment', 25)
+    scores = model.scores[:, model.products.index('investment')].astype(np.float64)
+    owners = analytics_instance.df['has_investment'].to_numpy()
+    expected = np.sort(scores[~owners])[::-1][:25]
+    np.testing.assert_allclose(top['score'], expected)
+    assert not analytics_instance.df.set_index('customer_id').loc[top['customer_id'], 'has_investment'].any()
+
+def test_segment_quotas_cap_segments(model):
+    top = model.top_k('mortgage', 40, segment_quotas={'Mass Market': 2, 'Digital Natives': 0})
+    counts = top['segment_name'].value_counts()
+    assert counts.get('Mass Market', 0) <= 2
+    assert counts.get('Digital Natives', 0) == 0
+    assert len(top) <= 40
+    assert top['score'].is_monotonic_decreasing
+
+def test_engine_orders_products_by_propensity(analytics_instance, model):
+    engine = BankingRecommendationEngine(analytics_instance, propensity=model)
+    customer = analytics_instance.df.iloc[0]
+    recs = engine._get_product_recs(customer)
+    scores = model.score_customer(customer)
+    missing = [p for p in engine.product_info if p not in customer['products_used']]
+    best = max(missing, key=lambda p: scores[p])
+    assert recs[0].startswith(engine.product_info[best]['desc'])
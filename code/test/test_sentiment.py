@@ -0,0 +1,51 @@
+import random
+import pytest
+import numpy as np
+from src.sentiment import BatchSentimentAnalyzer, banking_sentiment_analyzer
+
+WORDS = ("the app is not very good but I LOVE it !! never so bad at least kind of "
+         "great sort of slow isn't excellent service really extremely terrible ?? "
+         "confusing, ok. fees! hate just enough The GREAT (best) improvement").split()
+
+@pytest.fixture(scope='module')
+def analyzers():
+    return BatchSentimentAnalyzer(), banking_sentiment_analyzer()
+
+def _vader(sia, texts):
+    return np.array([sia.polarity_scores(t)['compound'] for t in texts])
+
+def test_matches_vader_on_feedback(analyzers):
+    batch, sia = analyzers
+    texts = [
+        "The mobile app needs improvement for bill payments",
+        "Excellent investment advisory services",
+        "Mortgage payment process is confusing",
+        "Best private banking experience ever",
+        "Credit card rewards could be better",
+        "Customer service response times are too slow",
+        "Interest rates on savings accounts are too low"
+    ]
+    np.testing.assert_allclose(batch.compound(texts), _vader(sia, texts))
+
+def test_matches_vader_on_rules(analyzers):
+    batch, sia = analyzers
+    rng = random.Random(0)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 14))) for _ in range(3000)]
+    texts += ["", "a", "Great app!!!", "not bad at all", "at least it works", "kind of good",
+              "slow. confusing great never fast slow better"]
+    np.testing.assert_allclose(batch.compound(texts), _vader(sia, texts))
+
+def test_chunks_and_processes_agree(analyzers):
+    batch, _ = analyzers
+    rng = random.Random(1)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(8)) for _ in range(500)]
+    expected = batch.compound(texts)
+    np.testing.assert_array_equal(batch.compound(texts, chunk_size=64), expected)
+    np.testing.assert_array_equal(batch.compound(texts, n_jobs=2, chunk_size=128), expected)
+
+def test_custom_lexicon():
+    batch = BatchSentimentAnalyzer(lexicon_updates={'overdraft': -2.5})
+    assert batch.compound(["overdraft again"])[0] < 0
+    # Custom terms are added on top of the banking lexicon
+    assert batch.lexicon['intuitive'] == 1.2
+    assert len(batch.compound([])) == 0
@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+from src.analytics import BankingCustomerAnalytics, SEGMENT_FEATURES
+from src.data_generation import generate_synthetic_banking_data
+from src.recommendations import BankingRecommendationEngine
+from src.sharding import ShardedAnalytics, shard_ids
+
+@pytest.fixture(scope='module')
+def sample_data():
+    return generate_synthetic_banking_data(200)
+
+@pytest.fixture(scope='module')
+def sharded(sample_data):
+    return ShardedAnalytics(sample_data, n_shards=3, max_workers=2, training_sample=None)
+
+def test_shard_ids_are_stable(sample_data):
+    first = shard_ids(sample_data, 4)
+    assert (first == shard_ids(sample_data, 4)).all()
+    assert set(first) <= {0, 1, 2, 3}
+    by_state = shard_ids(sample_data, 4, partition='state')
+    assert sample_data.groupby(by_state)['state'].nunique().sum() == sample_data['state'].nunique()
+
+def test_merged_frame_matches_single_process(sample_data, sharded):
+    single = BankingCustomerAnalytics(sample_data, fit=False).df
+    assert len(sharded.df) == len(sample_data)
+    assert (sharded.df['customer_id'].to_numpy() == sample_data['customer_id'].to_numpy()).all()
+    np.testing.assert_allclose(sharded.df['clv'], single['clv'])
+    np.testing.assert_allclose(sharded.df['sentiment'], single['sentiment'])
+    assert sharded.df.filter(like='has_').dtypes.eq(bool).all()
+
+def test_scores_come_from_shared_models(sharded):
+    features = sharded.df[SEGMENT_FEATURES].fillna(0).to_numpy()
+    np.testing.assert_allclose(sharded.scaled_features, sharded.scaler.transform(features))
+    assert (sharded.kmeans.predict(sharded.scaled_features) == sharded.df['segment']).all()
+    assert sharded.df['is_anomaly'].dtype == bool
+
+def test_merged_aggregates(sharded):
+    df = sharded.df
+    stats = sharded.segment_stats
+    assert stats['customers'].sum() == len(df)
+    expected = df.groupby('segment_name')['income'].mean()
+    np.testing.assert_allclose(stats.loc[expected.index, 'avg_income'], expected)
+    assert (sharded.sentiment_distribution == df['sentiment_category'].value_counts()
+            .reindex(sharded.sentiment_distribution.index, fill_value=0)).all()
+
+def test_recommendations_on_sharded_view(sharded):
+    engine = BankingRecommendationEngine(sharded)
+    recs = engine.generate_recommendations(sharded.df['customer_id'].iloc[0])
+    assert 'alerts' in recs
@@ -0,0 +1,121 @@
+import pytest
+import numpy as np
+from src.analytics import BankingCustomerAnalytics, SEGMENT_FEATURES
+from src.cache import RecommendationCache
+from src.data_generation import generate_synthetic_banking_data
+from src.recommendations import BankingRecommendationEngine
+from src.streaming import (
+    CompiledIsolationForest,
+    StreamingAnomalyScorer,
+    UPDATE_DTYPE,
+    UPDATE_FIELDS
+)
+
+@pytest.fixture(scope='module')
+def analytics_instance():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(300))
+
+def test_compiled_forest_matches_sklearn(analytics_instance):
+    detector = analytics_instance.anomaly_detector
+    X = analytics_instance.scaler.transform(analytics_instance.df[SEGMENT_FEATURES].fillna(0))
+    compiled = CompiledIsolationForest(detector)
+    np.testing.assert_allclose(compiled.score_samples(X), detector.score_samples(X))
+    assert (compiled.predict(X) == detector.predict(X)).all()
+
+def test_initial_state_reproduces_batch_flags(analytics_instance):
+    scorer = StreamingAnomalyScorer(analytics_instance)
+    scaled = (scorer._features(scorer.state) - scorer._mean) / scorer._scale
+    flagged = scorer.forest.predict(scaled) == -1
+    assert (flagged == analytics_instance.df['is_anomaly'].to_numpy()).all()
+
+def test_extreme_update_raises_alert(analytics_instance):
+    alerts = []
+    scorer = StreamingAnomalyScorer(analytics_instance, on_alert=alerts.append)
+    normal = analytics_instance.df.loc[~analytics_instance.df['is_anomaly'], 'customer_id'].iloc[0]
+
+    assert scorer.update(normal, 'investment_balance', 5e7, 1_700_000_000)
+    assert len(alerts) == 1
+    assert alerts[0]['customer_id'][0] == normal
+    assert scorer.customer_alerts(normal)
+
+    # Still anomalous, so no repeat alert
+    assert not scorer.update(normal, 'app_logins', 1, 1_700_000_100)
+
+def test_activity_counters_decay(analytics_instance):
+    scorer = StreamingAnomalyScorer(analytics_instance, window_days=1)
+    customer_id = analytics_instance.df['customer_id'].iloc[0]
+    row = 0
+    col = 2 + UPDATE_FIELDS.index('app_logins')
+    before = scorer.state[row, col]
+
+    scorer.update(customer_id, 'app_logins', 1, 0)
+    scorer.update(customer_id, 'app_logins', 0, 86400)
+    assert scorer.state[row, col] == pytest.approx((before + 1) * np.exp(-1))
+
+def test_out_of_order_updates(analytics_instance):
+    scorer = StreamingAnomalyScorer(analytics_instance, window_days=1)
+    normal = analytics_instance.df.loc[~analytics_instance.df['is_anomaly'], 'customer_id'].iloc[0]
+    row = int(np.flatnonzero(scorer.customer_ids == normal)[0])
+    col = 2 + UPDATE_FIELDS.index('app_logins')
+    before = scorer.state[row, col]
+
+    scorer.update(normal, 'app_logins', 1, 1_800_000_000)
+    # A late event neither rewinds the clock nor inflates the counters
+    assert not scorer.update(normal, 'app_logins', 0, 1_700_000_000)
+    assert scorer.last_seen[row] == 1_800_000_000
+    assert scorer.state[row, col] == pytest.approx(before + 1)
+    assert not scorer.customer_alerts(normal)
+
+    # Late increments count as decayed against the customer's own latest time
+    late = np.zeros(2, dtype=UPDATE_DTYPE)
+    late['customer_id'] = normal
+    late['timestamp'] = [1_800_000_000 + 86400, 1_800_000_000]
+    late['field'] = UPDATE_FIELDS.index('app_logins')
+    late['value'] = [0, 1]
+    scorer.process(late)
+    assert scorer.last_seen[row] == 1_800_000_000 + 86400
+    assert scorer.state[row, col] == pytest.approx((before + 2) * np.exp(-1))
+
+def test_out_of_order_balance_update(analytics_instance):
+    scorer = StreamingAnomalyScorer(analytics_instance)
+    customer_id = analytics_instance.df['customer_id'].iloc[0]
+    col = 2 + UPDATE_FIELDS.index('checking_balance')
+
+    scorer.update(customer_id, 'checking_balance', 5000, 1_800_000_000)
+    scorer.update(customer_id, 'checking_balance', 1.0, 1_700_000_000)
+    assert scorer.state[0, col] == 5000
+
+    # Within a batch the newest balance wins whatever the arrival order
+    updates = np.zeros(2, dtype=UPDATE_DTYPE)
+    updates['customer_id'] = customer_id
+    updates['timestamp'] = [1_800_000_200, 1_800_000_100]
+    updates['field'] = UPDATE_FIELDS.index('checking_balance')
+    updates['value'] = [7000, 6000]
+    scorer.process(updates)
+    assert scorer.state[0, col] == 7000
+
+def test_replay_batches(analytics_instance):
+    rng = np.random.default_rng(0)
+    updates = np.zeros(5000, dtype=UPDATE_DTYPE)
+    updates['customer_id'] = rng.choice(analytics_instance.df['customer_id'], len(updates))
+    updates['timestamp'] = np.sort(rng.integers(0, 86400, len(updates)))
+    updates['field'] = rng.integers(0, 6, len(updates))
+    updates['value'] = 1
+
+    scorer = StreamingAnomalyScorer(analytics_instance)
+    alerts = list(scorer.replay(updates, batch_size=512))
+    assert scorer.updates_seen == len(updates)
+    assert scorer.alerts_raised == sum(len(a) for a in alerts)
+
+def test_live_alert_reaches_recommendations(analytics_instance):
+    forwarded = []
+    cache = RecommendationCache()
+    scorer = StreamingAnomalyScorer(analytics_instance, on_alert=forwarded.append)
+    engine = BankingRecommendationEngine(analytics_instance, cache=cache, scorer=scorer)
+    normal = analytics_instance.df.loc[~analytics_instance.df['is_anomaly'], 'customer_id'].iloc[0]
+    customer = engine.find_customer(normal)
+
+    assert not any('Unusual activity' in a for a in engine.recommend(customer)['alerts'])
+    scorer.update(normal, 'investment_balance', 5e7, 1_700_000_000)
+    assert forwarded and len(cache) == 0
+    assert any('Unusual activity' in a for a in engine.recommend(customer)['alerts'])
@@ -1,10 +1,15 @@
 import pytest
 import pandas as pd
 import plotly.graph_objects as go
+from src.analytics import BankingCustomerAnalytics
+from src.data_generation import generate_synthetic_banking_data
 from src.visualization import (
     create_spending_profile,
     create_financial_health_radar,
-    create_trend_projection
+    create_trend_projection,
+    create_segment_scatter,
+    create_state_choropleth,
+    create_density_map
 )
 
 # Sample customer data for testing
@@ -98,3 +103,45 @@ def test_edge_cases():
     # Test with missing spending categories
     with pytest.raises(KeyError):
         create_spending_profile(pd.Series({}), ['nonexistent_category'])
+
+@pytest.fixture(scope='module')
+def population():
+    return BankingCustomerAnalytics(generate_synthetic_banking_data(600))
+
+def test_segment_scatter_is_binned(population):
+    """Population scatter uses WebGL and one marker per occupied cell"""
+    fig = create_segment_scatter(population, bins=20)
+    assert all(isinstance(trace, go.Scattergl) for trace in fig.data)
+    assert len(fig.data) == population.df['segment_name'].nunique()
+    assert sum(trace.customdata.sum() for trace in fig.data) == len(population.df)
+    assert sum(len(trace.x) for trace in fig.data) <= len(fig.data) * 20 * 20
+
+    fig = create_segment_scatter(population, color_by='is_anomaly', bins=20)
+    assert len(fig.data) == 2
+
+def test_state_choropleth(population):
+    fig = create_state_choropleth(population.df, metric='anomaly_rate')
+    df = population.df
+    assert len(fig.data[0].z) == df['state'].nunique()
+    assert sum(fig.data[0].customdata) == len(df)
+    assert max(fig.data[0].z) <= 1
+    assert create_state_choropleth(df).layout.title.text == "Average CLV by State"
+
+def test_density_map_size_is_fixed(population):
+    fig = create_density_map(population.df, bins=30)
+    heatmap = fig.data[0]
+    assert isinstance(heatmap, go.Heatmap)
+    assert len(heatmap.z) == 30 and len(heatmap.z[0]) == 30
+    assert heatmap.customdata.sum() == len(population.df)
+
+def test_radar_with_peer_context(sample_customer):
+    """Segment medians replace the ideal benchmark; percentiles show on hover"""
+    customer = sample_customer.copy()
+    customer['credit_score_pct'] = 61
+    customer['credit_score_segment_pct'] = 72
+    peers = {'debt_to_income': 0.3, 'savings_ratio': 0.1, 'investment_ratio': 0.2,
+             'credit_score': 680, 'digital_engagement_score': 50}
+    fig = create_financial_health_radar(customer, peers)
+    assert fig.data[1].name == 'Segment Median'
+    assert fig.data[1].r[3] == pytest.approx(680 / 850)
+    assert '72nd percentile in segment, 61st overall' in fig.data[0].hovertext